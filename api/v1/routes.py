@@ -175,11 +175,11 @@ async def upload_dataset(
             if ext in [".xlsx"]:
                 if sheet is None:
                     # If no sheet specified, read the first sheet
-                    df = pd.read_excel(tmp_file_path, sheet_name=0)
+                    df = StorageService.read_excel(tmp_file_path)
                 else:
-                    df = pd.read_excel(tmp_file_path, sheet_name=sheet)
+                    df = StorageService.read_excel(tmp_file_path, sheet_name=sheet)
             else:  # CSV
-                df = pd.read_csv(tmp_file_path)
+                df = StorageService.read_csv(tmp_file_path)
 
             if df.empty:
                 raise HTTPException(status_code=400, detail="Uploaded file is empty")
@@ -384,7 +384,7 @@ async def analyze_concentration(
             json.dump(analysis_result.data, f, indent=2, default=str)
 
         # Format data for exports (convert from analyzer format to export format)
-        export_data = {"by_period": [], "details": []}
+        export_data = {"by_period": [], "by_period_flat": [], "details": []}
 
         for period_key, period_data in analysis_result.data.items():
             if period_key == "summary":
@@ -397,6 +397,10 @@ async def analyze_concentration(
                 "head_sample": period_data.get("head_sample", []),
             }
             export_data["by_period"].append(period_export)
+            # Flat Summary row (top_N_count/value/pct columns) for the Excel export
+            export_data["by_period_flat"].append(
+                exporter.summary_row(period_key, period_export)
+            )
 
             # Add head sample to details (limit to 10 items per period)
             head_sample = period_data.get("head_sample", [])[:10]
@@ -31,7 +31,12 @@ class Settings(BaseSettings):
     llm_timeout: int = 30  # Request timeout in seconds
     llm_max_retries: int = 2  # Max retries for transient errors
     llm_cache_ttl: int = 86400  # Cache TTL in seconds (24 hours)
+    llm_cache_max_entries: int = 1024  # In-memory response cache capacity (LRU)
     llm_max_calls_per_dataset: int = 10  # Cost control per dataset
+    llm_max_concurrency: int = 4  # Max in-flight LLM requests from batch callers
+    llm_response_cache_dir: Optional[Path] = (
+        None  # If set, persist responses to identical requests on disk
+    )
 
     # Security / API
     allowed_origins: list[str] = [
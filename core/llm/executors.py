@@ -27,8 +27,15 @@ from core.llm.types import (
     DataQualityReport,
     ThresholdRecommendations,
     QAOverContext,
+    QABatch,
+    RISK_MEDIUM,
+    construct_llm_response,
+)
+from core.llm.prompt_builders import (
+    PROMPT_BUILDERS,
+    PromptBuilder,
+    PromptSecurityError,
 )
-from core.llm.prompt_builders import PROMPT_BUILDERS
 
 
 class LLMExecutionError(Exception):
@@ -92,6 +99,8 @@ class LLMExecutor:
         try:
             # Build prompt messages
             messages = prompt_builder(context, **prompt_kwargs)
+            # Serialize the context for hashing once; reused by cache key and artifacts
+            context_hash = llm_client._generate_context_hash(context)
 
             # Execute LLM request
             response_json, metrics = await llm_client.chat_json(
@@ -102,6 +111,7 @@ class LLMExecutor:
                 dataset_id=dataset_id,
                 function_name=function_name,
                 context=context,
+                context_hash=context_hash,
             )
 
             # Create artifact for persistence
@@ -112,7 +122,7 @@ class LLMExecutor:
                 timestamp=start_time.isoformat(),
                 model=metrics.model,
                 provider=metrics.provider,
-                context_hash=llm_client._generate_context_hash(context),
+                context_hash=context_hash,
                 response=response_json,
                 latency_ms=metrics.latency_ms,
                 usage=metrics.usage,
@@ -162,7 +172,7 @@ class LLMExecutor:
                 timestamp=start_time.isoformat(),
                 model=model or settings.llm_model,
                 provider=settings.llm_provider or "openai",
-                context_hash=llm_client._generate_context_hash(context),
+                context_hash=context_hash,
                 response=fallback_result,
                 latency_ms=0,
                 error=str(e),
@@ -209,7 +219,7 @@ class LLMExecutor:
                 ],
             },
             "risk_flags": {
-                "level": "medium",
+                "level": RISK_MEDIUM,
                 "reasons": [
                     "Unable to assess risk level - please review concentration metrics manually"
                 ],
@@ -228,10 +238,26 @@ class LLMExecutor:
                 "citations": [],
                 "confidence": "low",
             },
+            "qa_batch": {"answers": []},
         }
 
         return fallbacks.get(function_name, {"error": "Unknown function"})
 
+    @staticmethod
+    def _build_response(
+        function_name: str, result: Dict[str, Any], status: LLMStatus
+    ):
+        """
+        Response model for an executor result.
+
+        LLM output (status.used) was validated by the client just before it was
+        returned, so the model is constructed without re-validation; fallback
+        payloads are validated.
+        """
+        if status.used:
+            return construct_llm_response(function_name, result)
+        return LLM_FUNCTION_MODELS[function_name].model_validate(result)
+
     # Individual function executors
 
     async def generate_schema_description(
@@ -251,7 +277,7 @@ class LLMExecutor:
             model=model,
         )
 
-        return SchemaDescription(**result), status
+        return self._build_response("schema_description", result, status), status
 
     async def generate_narrative_insights(
         self,
@@ -275,7 +301,7 @@ class LLMExecutor:
             model=model,
         )
 
-        return NarrativeInsights(**result), status
+        return self._build_response("narrative_insights", result, status), status
 
     async def generate_risk_flags(
         self,
@@ -293,7 +319,7 @@ class LLMExecutor:
             model=model,
         )
 
-        return RiskFlags(**result), status
+        return self._build_response("risk_flags", result, status), status
 
     async def generate_data_quality_report(
         self,
@@ -315,7 +341,7 @@ class LLMExecutor:
             model=model,
         )
 
-        return DataQualityReport(**result), status
+        return self._build_response("data_quality_report", result, status), status
 
     async def generate_threshold_recommendations(
         self,
@@ -337,7 +363,8 @@ class LLMExecutor:
             model=model,
         )
 
-        return ThresholdRecommendations(**result), status
+        response = self._build_response("threshold_recommendations", result, status)
+        return response, status
 
     async def answer_question(
         self,
@@ -358,7 +385,59 @@ class LLMExecutor:
             user_question=user_question,  # This goes to prompt builder
         )
 
-        return QAOverContext(**result), status
+        return self._build_response("qa_over_context", result, status), status
+
+    async def answer_questions_batch(
+        self,
+        dataset_id: str,
+        questions: List[str],
+        context: Dict[str, Any],
+        request_id: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Tuple[QABatch, LLMStatus]:
+        """
+        Answer several questions over the same context in a single LLM request.
+
+        The context is sent once rather than once per question. Answers are
+        matched back to the questions, in the order asked; any question without
+        an answer (fallback, or dropped by the model) gets the standard Q&A
+        fallback answer.
+        """
+        if not questions:
+            raise LLMExecutionError(
+                "answer_questions_batch needs at least one question"
+            )
+
+        result, status = await self._execute_llm_function(
+            function_name="qa_batch",
+            dataset_id=dataset_id,
+            context=context,
+            request_id=request_id,
+            model=model,
+            user_questions=questions,  # This goes to prompt builder
+        )
+
+        # The model echoes the question as it appeared in the prompt, i.e.
+        # after truncation/redaction, so match on either form
+        answered = {answer["question"]: answer for answer in result["answers"]}
+        fallback = self._get_fallback_response("qa_over_context")
+        answers = []
+        for question in questions:
+            answer = answered.get(question) or answered.get(
+                self._prompt_form(question)
+            )
+            answers.append({**(answer or fallback), "question": question})
+
+        # Assembled here (partly from fallbacks), so always validated
+        return QABatch.model_validate({"answers": answers}), status
+
+    @staticmethod
+    def _prompt_form(question: str) -> Optional[str]:
+        """A question as sent in the prompt, or None if it would be rejected."""
+        try:
+            return PromptBuilder._validate_user_question(question)
+        except PromptSecurityError:
+            return None
 
     # Convenience methods for common use cases
 
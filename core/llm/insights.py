@@ -10,7 +10,8 @@ from dataclasses import dataclass
 import asyncio
 
 from core.llm.executors import llm_executor
-from core.llm.types import NarrativeInsights, RiskFlags, LLMStatus
+from services.llm_client import llm_client
+from core.llm.types import NarrativeInsights, RiskFlags, LLMStatus, RISK_MEDIUM
 
 
 @dataclass
@@ -71,14 +72,17 @@ class InsightGenerator:
                 import concurrent.futures
 
                 with concurrent.futures.ThreadPoolExecutor() as executor_pool:
+                    # One-shot loop: close its LLM clients before it ends
                     future = executor_pool.submit(
                         asyncio.run,
-                        self._async_generate_insights(
-                            concentration_results,
-                            schema,
-                            dataset_stats,
-                            dataset_id,
-                            request_id,
+                        llm_client.run_in_loop(
+                            self._async_generate_insights(
+                                concentration_results,
+                                schema,
+                                dataset_stats,
+                                dataset_id,
+                                request_id,
+                            )
                         ),
                     )
                     full_insights = future.result(
@@ -118,7 +122,7 @@ class InsightGenerator:
                     "confidence_notes": [f"LLM insight generation failed: {str(e)}"],
                 },
                 "risk_assessment": {
-                    "level": "medium",
+                    "level": RISK_MEDIUM,
                     "reasons": [
                         "Unable to assess risk level - please review metrics manually"
                     ],
@@ -191,7 +195,7 @@ class InsightGenerator:
                 risk_flags, risk_status = results[1]
                 risk_data = risk_flags.model_dump()
             else:
-                risk_data = {"level": "medium", "reasons": ["Unable to assess risk"]}
+                risk_data = {"level": RISK_MEDIUM, "reasons": ["Unable to assess risk"]}
                 risk_status = LLMStatus(used=False, reason="execution_error")
 
             # Compile comprehensive insights
@@ -232,7 +236,7 @@ class InsightGenerator:
                 "insights": {
                     "narrative": self._get_fallback_narrative(),
                     "risk_assessment": {
-                        "level": "medium",
+                        "level": RISK_MEDIUM,
                         "reasons": ["Analysis error"],
                     },
                     "generated_at": f"{request_id or 'unknown'}",
@@ -8,7 +8,6 @@ and consistent formatting for all LLM functions.
 import json
 import re
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
 
 
@@ -181,7 +180,11 @@ class PromptBuilder:
         return cls._redact_pii(question)
 
 
-# LLM function prompts organized by function name
+# LLM function prompts organized by function name.
+# Messages are built static-first: the fixed system prompt, then the context,
+# then any per-request text (e.g. the user question). Nothing volatile (ids,
+# timestamps) goes into the prompt, so provider prompt caching can reuse the
+# prefix and identical requests hash to the same response cache key.
 LLM_FUNCTION_PROMPTS = {
     "schema_description": """You are a data schema analyst. Your task is to analyze dataset schemas and provide business context descriptions.
 
@@ -295,6 +298,28 @@ LLM_FUNCTION_PROMPTS = {
     - Appropriate confidence level based on data completeness
 
     Output valid JSON only.""",
+    "qa_batch": """You are a data analyst assistant. Answer each user question using ONLY the provided context data.
+
+    CRITICAL REQUIREMENTS:
+    1. Answer ONLY based on information in the provided CONTEXT_JSON
+    2. If data is not available, clearly state "This information is not available in the provided data"
+    3. Cite specific context references for each answer
+    4. Be precise with numbers and facts
+    5. Output MUST be valid JSON with this EXACT structure (no wrapper objects):
+    {
+    "answers": [
+        {
+        "question": "the question, verbatim",
+        "answer": "string - answer based on the context",
+        "citations": ["list of context references"],
+        "confidence": "high|medium|low"
+        }
+    ]
+    }
+    6. Return exactly one answer per question, in the order the questions are given
+    7. NO prose or explanation outside the JSON response
+
+    Output ONLY the JSON object directly - no wrapper, no schema name.""",
 }
 
 
@@ -363,7 +388,6 @@ def build_data_quality_prompt(
     context = {
         "schema": schema,
         "normalization_warnings": normalization_warnings or [],
-        "timestamp": datetime.now().isoformat(),
     }
 
     context_json = PromptBuilder._prepare_context_json(context)
@@ -418,6 +442,24 @@ def build_qa_prompt(
     ]
 
 
+def build_qa_batch_prompt(
+    user_questions: List[str], context: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    """Build prompt answering several questions over one copy of the context."""
+    safe_questions = [PromptBuilder._validate_user_question(q) for q in user_questions]
+    numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(safe_questions, 1))
+
+    context_json = PromptBuilder._prepare_context_json(context)
+
+    return [
+        {"role": "system", "content": LLM_FUNCTION_PROMPTS["qa_batch"]},
+        {
+            "role": "user",
+            "content": f"CONTEXT_JSON:\n{context_json}\n\nUser Questions:\n{numbered}\n\nAnswer each question based only on the provided context data.",
+        },
+    ]
+
+
 # Function mapping for easy access
 def _wrap_schema(context: Dict[str, Any], **kwargs) -> List[Dict[str, str]]:
     return build_schema_description_prompt(
@@ -461,6 +503,13 @@ def _wrap_qa(context: Dict[str, Any], **kwargs) -> List[Dict[str, str]]:
     )
 
 
+def _wrap_qa_batch(context: Dict[str, Any], **kwargs) -> List[Dict[str, str]]:
+    return build_qa_batch_prompt(
+        user_questions=kwargs.get("user_questions", []),
+        context=context,
+    )
+
+
 PROMPT_BUILDERS = {
     "schema_description": _wrap_schema,
     "narrative_insights": _wrap_narrative,
@@ -468,4 +517,5 @@ PROMPT_BUILDERS = {
     "data_quality_report": _wrap_dq,
     "threshold_recommendations": _wrap_thresholds,
     "qa_over_context": _wrap_qa,
+    "qa_batch": _wrap_qa_batch,
 }
@@ -9,6 +9,7 @@ import pandas as pd
 import asyncio
 
 from core.llm.executors import llm_executor
+from services.llm_client import llm_client
 from core.llm.types import SchemaDescription, LLMStatus
 
 
@@ -69,10 +70,13 @@ class SchemaDescriber:
                 import concurrent.futures
 
                 with concurrent.futures.ThreadPoolExecutor() as executor:
+                    # One-shot loop: close its LLM clients before it ends
                     future = executor.submit(
                         asyncio.run,
-                        self._async_enhance_schema(
-                            base_schema, dataset_stats, dataset_id, request_id
+                        llm_client.run_in_loop(
+                            self._async_enhance_schema(
+                                base_schema, dataset_stats, dataset_id, request_id
+                            )
                         ),
                     )
                     description, llm_status = future.result(timeout=60)
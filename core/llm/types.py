@@ -5,8 +5,7 @@ Comprehensive Pydantic models for all LLM function contracts.
 Ensures structured JSON outputs with strict validation.
 """
 
-from typing import List, Dict, Any, Optional
-from enum import Enum
+from typing import List, Dict, Any, Optional, Literal
 from pydantic import BaseModel, Field, validator, ConfigDict
 
 
@@ -83,26 +82,21 @@ class NarrativeInsights(BaseModel):
     """Narrative insights from concentration analysis."""
 
     executive_summary: str = Field(
-        description="High-level summary of key findings for executives",
-        min_length=10,
-        max_length=500,
+        description="High-level summary of key findings for executives (~500 chars)"
     )
     key_findings: List[str] = Field(
-        description="Specific quantitative findings from the analysis",
+        description="Specific quantitative findings from the analysis (up to 10)",
         min_length=1,
-        max_length=10,
     )
     risk_indicators: List[str] = Field(
-        description="Potential risks identified from concentration patterns",
-        max_length=5,
+        description="Potential risks identified from concentration patterns (up to 5)"
     )
     opportunities: List[str] = Field(
-        description="Business opportunities suggested by the data", max_length=5
+        description="Business opportunities suggested by the data (up to 5)"
     )
     recommendations: List[str] = Field(
-        description="Actionable recommendations based on findings",
+        description="Actionable recommendations based on findings (up to 5)",
         min_length=1,
-        max_length=5,
     )
     confidence_notes: List[str] = Field(
         default_factory=list,
@@ -135,12 +129,12 @@ class NarrativeInsights(BaseModel):
     )
 
 
-class RiskLevel(str, Enum):
-    """Risk level enumeration."""
+# Risk level values accepted by RiskFlags.level
+RISK_LOW = "low"
+RISK_MEDIUM = "medium"
+RISK_HIGH = "high"
 
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
+RiskLevel = Literal["low", "medium", "high"]
 
 
 class RiskFlags(BaseModel):
@@ -148,18 +142,12 @@ class RiskFlags(BaseModel):
 
     level: RiskLevel = Field(description="Overall risk level assessment")
     reasons: List[str] = Field(
-        description="Specific reasons for the risk level", min_length=1, max_length=5
+        description="Specific reasons for the risk level (up to 5)", min_length=1
     )
     score: Optional[float] = Field(
         default=None, description="Numerical risk score (0-100)", ge=0, le=100
     )
 
-    @validator("reasons")
-    def validate_reasons(cls, v):
-        if not v:
-            raise ValueError("At least one reason must be provided")
-        return v
-
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -177,11 +165,9 @@ class RiskFlags(BaseModel):
 class DataQualityReport(BaseModel):
     """Data quality assessment and recommendations."""
 
-    issues: List[str] = Field(
-        description="Identified data quality issues", max_length=10
-    )
+    issues: List[str] = Field(description="Identified data quality issues (up to 10)")
     recommendations: List[str] = Field(
-        description="Recommended actions to improve data quality", max_length=10
+        description="Recommended actions to improve data quality (up to 10)"
     )
     severity_score: Optional[int] = Field(
         default=None,
@@ -213,12 +199,10 @@ class ThresholdRecommendations(BaseModel):
     """Recommended concentration thresholds with rationale."""
 
     suggested: List[int] = Field(
-        description="Suggested threshold percentages", min_length=1, max_length=5
+        description="Suggested threshold percentages (up to 5)", min_length=1
     )
     rationale: str = Field(
-        description="Explanation for the suggested thresholds",
-        min_length=10,
-        max_length=300,
+        description="Explanation for the suggested thresholds (~300 chars)"
     )
 
     @validator("suggested")
@@ -243,13 +227,11 @@ class QAOverContext(BaseModel):
     """Question answering over provided context."""
 
     answer: str = Field(
-        description="Answer to the user's question based on available context",
+        description="Answer to the user's question based on available context (~500 chars)",
         min_length=1,
-        max_length=500,
     )
     citations: List[str] = Field(
-        description="Specific references to context data that support the answer",
-        max_length=5,
+        description="Specific references to context data that support the answer (up to 5)"
     )
     confidence: Optional[str] = Field(
         default=None, description="Confidence level in the answer (high/medium/low)"
@@ -266,6 +248,35 @@ class QAOverContext(BaseModel):
     )
 
 
+class QAAnswer(QAOverContext):
+    """One answer within a batched Q&A response."""
+
+    question: str = Field(description="The question being answered, verbatim")
+
+
+class QABatch(BaseModel):
+    """Answers to several questions over one shared context."""
+
+    answers: List[QAAnswer] = Field(
+        description="One answer per question, in the order asked", min_length=1
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "answers": [
+                    {
+                        "question": "How many customers are in the dataset?",
+                        "answer": "The dataset contains 500 customers.",
+                        "citations": ["totals.total_entities"],
+                        "confidence": "high",
+                    }
+                ]
+            }
+        }
+    )
+
+
 class LLMArtifact(BaseModel):
     """Container for LLM artifacts with full audit trail."""
 
@@ -320,9 +331,38 @@ LLM_FUNCTION_MODELS = {
     "data_quality_report": DataQualityReport,
     "threshold_recommendations": ThresholdRecommendations,
     "qa_over_context": QAOverContext,
+    "qa_batch": QABatch,
 }
 
 
+def construct_llm_response(name: str, data: Dict[str, Any]) -> BaseModel:
+    """
+    Build a response model from already-validated data without re-validation.
+
+    Only for dicts the LLM client has just validated against the function's
+    model; fallbacks, stored artifacts and other payloads go through
+    model_validate.
+    """
+    match name:
+        case "schema_description":
+            return SchemaDescription.model_construct(**data)
+        case "narrative_insights":
+            return NarrativeInsights.model_construct(**data)
+        case "risk_flags":
+            return RiskFlags.model_construct(**data)
+        case "data_quality_report":
+            return DataQualityReport.model_construct(**data)
+        case "threshold_recommendations":
+            return ThresholdRecommendations.model_construct(**data)
+        case "qa_over_context":
+            return QAOverContext.model_construct(**data)
+        case "qa_batch":
+            answers = [QAAnswer.model_construct(**a) for a in data["answers"]]
+            return QABatch.model_construct(answers=answers)
+        case _:
+            raise KeyError(f"Unknown LLM function: {name}")
+
+
 # Export schemas for reference
 def export_schemas() -> Dict[str, Dict[str, Any]]:
     """Export all schemas for documentation."""
@@ -8,23 +8,108 @@ It generates both Excel and CSV versions with various sampling strategies.
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
 import json
 import argparse
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 import hashlib
 import sys
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 from services.storage import StorageService
 
+# Anything that isn't a letter, digit, underscore or whitespace (RE2 syntax;
+# Unicode classes keep parity with Python's \w)
+SPECIAL_CHARS_PATTERN = r'[^\p{L}\p{N}_\s]'
+
+def _write_csv_with_checksum(df: pd.DataFrame, path: Path) -> str:
+    """Write a CSV with pandas and return its checksum."""
+    StorageService.write_csv(df, path)
+    return StorageService.calculate_checksum(path)
+
+
+def write_sample_files(output_dir: Path, df: pd.DataFrame, name: str, description: str,
+                       formats: Tuple[str, ...], pool: Optional[Executor] = None) -> Dict[str, Any]:
+    """
+    Write one fixture sample to <output_dir>/sample_data in the given formats.
+    
+    Module-level so it can run in worker processes.
+    
+    Args:
+        output_dir: Fixture output directory
+        df: DataFrame to save
+        name: Base name for the file
+        description: Description of the sampling strategy
+        formats: Output formats ('csv', 'xlsx')
+        pool: Optional executor to run the format writes concurrently
+    
+    Returns:
+        Metadata about the saved files (one entry per written format)
+    """
+    def submit(fn, *args) -> Future:
+        if pool is not None:
+            return pool.submit(fn, *args)
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    
+    # Ensure sample_data subdirectory exists
+    sample_dir = output_dir / "sample_data"
+    sample_dir.mkdir(exist_ok=True)
+    
+    # Submit all writes before waiting so Excel and CSV are written concurrently
+    futures = {}
+    if "xlsx" in formats:
+        excel_path = sample_dir / f"{name}.xlsx"
+        futures["excel"] = (excel_path, submit(StorageService.write_excel_with_checksum, df, excel_path))
+    if "csv" in formats:
+        csv_path = sample_dir / f"{name}.csv"
+        # Convert to Arrow once up front; the CSV writer consumes the Table directly
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            # Mixed-type object columns have no Arrow type; pandas writes them as-is
+            futures["csv"] = (csv_path, submit(_write_csv_with_checksum, df, csv_path))
+        else:
+            futures["csv"] = (csv_path, submit(StorageService.write_csv_arrow, table, csv_path))
+    
+    sample_metadata = {
+        "name": name,
+        "description": description,
+        "rows": len(df),
+        "columns": len(df.columns),
+    }
+    for key, (path, future) in futures.items():
+        checksum = future.result()
+        size = path.stat().st_size
+        print(f"  ✓ {path.name} ({size / 1024:.1f} KB)")
+        sample_metadata[key] = {
+            "path": str(path.relative_to(output_dir)),
+            "size_bytes": size,
+            "checksum": checksum
+        }
+    
+    return sample_metadata
+
 
 class TestFixtureGenerator:
     """Generate test fixtures from real data files."""
     
-    def __init__(self, source_file: Path, output_dir: Path, seed: Optional[int] = 42):
+    def __init__(self, source_file: Path, output_dir: Path, seed: Optional[int] = 42,
+                 engine: str = "auto", use_cache: bool = True,
+                 formats: Tuple[str, ...] = ("csv",), workers: int = 1,
+                 write_pool: Optional[Executor] = None):
         """
         Initialize fixture generator.
         
@@ -32,45 +117,119 @@ class TestFixtureGenerator:
             source_file: Path to source Excel file
             output_dir: Output directory for fixtures
             seed: Random seed for reproducibility
+            engine: Excel reader engine ('auto', 'calamine', 'openpyxl')
+            use_cache: Reuse/write a Parquet copy of the source next to it
+            formats: Fixture output formats ('csv', 'xlsx')
+            workers: Worker processes used to write fixtures (1 = in-process)
+            write_pool: Optional executor to overlap each fixture's format writes
+                when writing in-process
         """
         self.source_file = Path(source_file)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.formats = tuple(formats)
+        self.workers = workers
+        self.write_pool = write_pool
         
-        # Set random seed for reproducibility
-        np.random.seed(seed)
+        # Single seeded generator shared by all sampling so each fixture draws
+        # different rows while the whole run stays reproducible
         self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self._permutation: Optional[np.ndarray] = None
         
         # Load source data
         print(f"Loading source file: {self.source_file}")
-        self.df = pd.read_excel(self.source_file)
+        self.df = self._load_source(engine, use_cache)
         self.original_shape = self.df.shape
         print(f"Loaded {self.original_shape[0]} rows, {self.original_shape[1]} columns")
         
         # Detect column types
         self._detect_columns()
         
+    def _load_source(self, engine: str = "auto", use_cache: bool = True) -> pd.DataFrame:
+        """
+        Load the source data, using a Parquet sidecar cache when fresh.
+        
+        Parquet keeps dtypes and is far cheaper to read than Excel, so repeated
+        runs skip the Excel parse entirely.
+        
+        Args:
+            engine: Excel reader engine used on cache miss
+            use_cache: Whether to read/write the Parquet cache
+        
+        Returns:
+            Source DataFrame
+        """
+        cache_path = self.source_file.with_suffix(".parquet")
+        if use_cache and cache_path.exists() and \
+           cache_path.stat().st_mtime >= self.source_file.stat().st_mtime:
+            print(f"Using cached source: {cache_path}")
+            return pd.read_parquet(cache_path, engine="pyarrow")
+        
+        df = self._read_source(engine)
+        if use_cache:
+            try:
+                df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+            except Exception as e:
+                # Mixed-type object columns can't always be stored; just skip caching
+                print(f"Could not write source cache ({e}), continuing without it")
+        return df
+    
+    def _read_source(self, engine: str = "auto") -> pd.DataFrame:
+        """
+        Read the source Excel file.
+        
+        The calamine (Rust) reader is much faster than openpyxl on large files and
+        keeps native cell types, so datetime detection still works. 'auto' uses
+        calamine when python-calamine is installed and falls back to openpyxl.
+        
+        Args:
+            engine: Reader engine ('auto', 'calamine', 'openpyxl')
+        
+        Returns:
+            Source DataFrame
+        """
+        if engine in ("auto", "calamine"):
+            try:
+                return pd.read_excel(self.source_file, engine="calamine")
+            except ImportError:
+                if engine == "calamine":
+                    raise
+                print("python-calamine not installed, falling back to openpyxl")
+        return pd.read_excel(self.source_file, engine="openpyxl")
+    
     def _detect_columns(self):
         """Detect time, group, and value columns."""
         self.time_column = None
         self.group_columns = []
         self.value_columns = []
         
-        for col in self.df.columns:
+        # Cardinality of all text/categorical columns in one pass over a bounded head
+        inference_rows = self.df.head(50_000)
+        text_columns = self.df.select_dtypes(include=["object", "category"]).columns
+        unique_counts = inference_rows[text_columns].nunique()
+        
+        for col, dtype in self.df.dtypes.items():
+            kind = dtype.kind
             # Check if it's a time column
-            if pd.api.types.is_datetime64_any_dtype(self.df[col]):
+            if kind == 'M':
                 self.time_column = col
-            elif col.lower() in ['date', 'period', 'month', 'quarter', 'year']:
+            elif str(col).lower() in ['date', 'period', 'month', 'quarter', 'year']:
                 self.time_column = col
             # Check if it's a categorical/group column
-            elif pd.api.types.is_object_dtype(self.df[col]) or \
-                 pd.api.types.is_categorical_dtype(self.df[col]):
-                if self.df[col].nunique() < len(self.df) * 0.5:  # Less than 50% unique
+            elif col in unique_counts.index:
+                if unique_counts[col] < len(inference_rows) * 0.5:  # Less than 50% unique
                     self.group_columns.append(col)
             # Check if it's a numeric value column
-            elif pd.api.types.is_numeric_dtype(self.df[col]):
+            elif kind in 'biuf':
                 self.value_columns.append(col)
         
+        # Group columns as category: groupby/isin work on integer codes instead of
+        # hashing strings. Very high-cardinality columns stay as strings.
+        for col in self.group_columns:
+            if unique_counts[col] <= 10_000:
+                self.df[col] = self.df[col].astype("category")
+        
         print(f"Detected time column: {self.time_column}")
         print(f"Detected group columns: {self.group_columns[:3]}...")
         print(f"Detected value columns: {self.value_columns[:3]}...")
@@ -86,7 +245,11 @@ class TestFixtureGenerator:
             Sampled DataFrame
         """
         sample_size = int(len(self.df) * (percentage / 100))
-        return self.df.sample(n=sample_size, random_state=self.seed)
+        # One shared row permutation serves every random sample; each sample is a
+        # prefix of it, so smaller samples are nested in larger ones
+        if self._permutation is None:
+            self._permutation = self.rng.permutation(len(self.df))
+        return self.df.take(self._permutation[:sample_size])
     
     def time_balanced_sample(self, rows_per_period: int = 10) -> pd.DataFrame:
         """
@@ -102,15 +265,13 @@ class TestFixtureGenerator:
             print("No time column detected, falling back to random sample")
             return self.random_sample(20)
         
-        # Group by time period and sample from each
-        sampled_dfs = []
-        for period, group in self.df.groupby(self.time_column):
-            if len(group) <= rows_per_period:
-                sampled_dfs.append(group)
-            else:
-                sampled_dfs.append(group.sample(n=rows_per_period, random_state=self.seed))
-        
-        return pd.concat(sampled_dfs, ignore_index=True)
+        # Shuffle row positions (with only the time column alongside), then keep
+        # up to rows_per_period of each period: min(len(period), rows_per_period)
+        # random rows per period, without copying the other columns
+        periods = self.df[self.time_column].reset_index(drop=True)
+        shuffled = periods.take(self.rng.permutation(len(periods)))
+        positions = shuffled.groupby(shuffled, sort=False, observed=True).head(rows_per_period).index
+        return self.df.take(np.sort(positions.to_numpy())).reset_index(drop=True)
     
     def top_entities_sample(self, top_n: int = 10) -> pd.DataFrame:
         """
@@ -131,11 +292,18 @@ class TestFixtureGenerator:
         value_col = self.value_columns[0]
         
         # Calculate totals per entity
-        entity_totals = self.df.groupby(group_col)[value_col].sum().sort_values(ascending=False)
-        top_entities = entity_totals.head(top_n).index
-        
-        # Filter for top entities
-        return self.df[self.df[group_col].isin(top_entities)]
+        entity_totals = self.df.groupby(group_col, sort=False, observed=True)[value_col].sum()
+        top_entities = entity_totals.nlargest(top_n).index
+        
+        # Filter for top entities; categorical columns compare integer codes
+        # rather than hashing every string value
+        column = self.df[group_col]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            top_codes = column.cat.categories.get_indexer(top_entities)
+            mask = np.isin(column.cat.codes.to_numpy(), top_codes)
+        else:
+            mask = column.isin(top_entities).to_numpy()
+        return self.df[mask]
     
     def edge_cases_sample(self, force_nulls: bool = True) -> pd.DataFrame:
         """
@@ -147,32 +315,52 @@ class TestFixtureGenerator:
         Returns:
             DataFrame with edge cases including nulls
         """
-        edge_cases = []
+        # Collect row positions only; rows are gathered once at the end
+        edge_positions = []
         
         # Add rows with null values (existing nulls from source data)
-        null_mask = self.df.isnull().any(axis=1)
-        if null_mask.any():
-            edge_cases.append(self.df[null_mask].head(5))
+        null_mask = self.df.isnull().any(axis=1).to_numpy()
+        edge_positions.append(np.flatnonzero(null_mask)[:5])
         
-        # Add rows with extreme values for each numeric column
+        # Add rows with extreme values (2 min + 2 max) for each numeric column
         for col in self.value_columns[:3]:  # Limit to first 3 value columns
             if pd.api.types.is_numeric_dtype(self.df[col]):
-                # Min values
-                edge_cases.append(self.df.nsmallest(2, col))
-                # Max values
-                edge_cases.append(self.df.nlargest(2, col))
+                values = self.df[col].to_numpy(dtype=float, na_value=np.nan)
+                valid = np.flatnonzero(~np.isnan(values))
+                if len(valid) > 4:
+                    # O(n) partial partition instead of a sort per nsmallest/nlargest
+                    kth = [0, 1, len(valid) - 2, len(valid) - 1]
+                    part = np.argpartition(values[valid], kth)
+                    edge_positions.append(valid[part[kth]])
+                else:
+                    edge_positions.append(valid)
         
         # Add rows with special characters in text columns
         for col in self.group_columns[:2]:  # Limit to first 2 group columns
-            if pd.api.types.is_object_dtype(self.df[col]):
-                # Look for special characters
-                special_mask = self.df[col].astype(str).str.contains(r'[^\w\s]', regex=True, na=False)
-                if special_mask.any():
-                    edge_cases.append(self.df[special_mask].head(3))
+            if pd.api.types.is_object_dtype(self.df[col]) or \
+               isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                # Look for special characters; for categoricals only the distinct
+                # categories are scanned and the result is mapped through the codes
+                column = self.df[col]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    codes = column.cat.codes.to_numpy()
+                    if len(column.cat.categories):
+                        category_mask = self._has_special_chars(column.cat.categories)
+                        # Missing values have code -1; index with 0 and mask them out
+                        special_mask = (codes >= 0) & category_mask[
+                            np.where(codes >= 0, codes, 0)
+                        ]
+                    else:
+                        # No categories means every value is missing
+                        special_mask = np.zeros(len(codes), dtype=bool)
+                else:
+                    special_mask = self._has_special_chars(column)
+                edge_positions.append(np.flatnonzero(special_mask)[:3])
         
         # Create base edge cases DataFrame
-        if edge_cases:
-            edge_df = pd.concat(edge_cases, ignore_index=True).drop_duplicates()
+        all_positions = np.unique(np.concatenate(edge_positions))
+        if len(all_positions):
+            edge_df = self.df.take(all_positions).reset_index(drop=True)
         else:
             print("No natural edge cases found, using random sample as base")
             edge_df = self.random_sample(10)
@@ -185,6 +373,12 @@ class TestFixtureGenerator:
         
         return edge_df
     
+    @staticmethod
+    def _has_special_chars(values) -> np.ndarray:
+        """Boolean mask of values containing special characters, via Arrow's RE2 kernel."""
+        arr = pa.array(pd.Series(values).astype(str).to_numpy(), type=pa.string())
+        return pc.match_substring_regex(arr, SPECIAL_CHARS_PATTERN).to_numpy(zero_copy_only=False)
+    
     def stratified_sample(self, percentage: float = 20.0) -> pd.DataFrame:
         """
         Create a stratified sample maintaining data distribution.
@@ -201,21 +395,12 @@ class TestFixtureGenerator:
         # Use first group column for stratification
         group_col = self.group_columns[0]
         
-        # Calculate sample size per group
-        group_sizes = self.df[group_col].value_counts()
-        sample_sizes = (group_sizes * (percentage / 100)).round().astype(int)
-        sample_sizes = sample_sizes[sample_sizes > 0]  # Remove groups with 0 samples
-        
-        # Sample from each group
-        sampled_dfs = []
-        for group_value, sample_size in sample_sizes.items():
-            group_df = self.df[self.df[group_col] == group_value]
-            if len(group_df) <= sample_size:
-                sampled_dfs.append(group_df)
-            else:
-                sampled_dfs.append(group_df.sample(n=sample_size, random_state=self.seed))
-        
-        return pd.concat(sampled_dfs, ignore_index=True)
+        # Sample round(size * pct) rows from each group in a single groupby pass;
+        # groups that round to 0 rows drop out naturally
+        sampled = self.df.groupby(group_col, sort=False, observed=True).sample(
+            frac=percentage / 100, random_state=self.rng
+        )
+        return sampled.reset_index(drop=True)
     
     def add_random_nulls(self, df: pd.DataFrame, null_percentage: float = 10.0, 
                         columns: Optional[list] = None, preserve_key_columns: bool = True) -> pd.DataFrame:
@@ -231,7 +416,8 @@ class TestFixtureGenerator:
         Returns:
             DataFrame with added null values
         """
-        df_with_nulls = df.copy()
+        # Shallow copy: only the columns that receive nulls are rebuilt below
+        df_with_nulls = df.copy(deep=False)
         
         # Determine which columns to add nulls to
         target_columns = columns if columns else df.columns.tolist()
@@ -256,8 +442,8 @@ class TestFixtureGenerator:
             n_nulls = max(1, int(len(df) * null_percentage / 100))  # At least 1 null
             n_nulls = min(n_nulls, len(df))  # Don't exceed available rows
             
-            null_indices = np.random.choice(df.index, size=n_nulls, replace=False)
-            df_with_nulls.loc[null_indices, col] = np.nan
+            null_positions = self.rng.choice(len(df), size=n_nulls, replace=False)
+            self._set_nulls(df_with_nulls, col, null_positions)
         
         return df_with_nulls
     
@@ -279,70 +465,80 @@ class TestFixtureGenerator:
         if column not in df.columns:
             raise ValueError(f"Column '{column}' not found in DataFrame")
         
-        df_with_nulls = df.copy()
+        df_with_nulls = df.copy(deep=False)
         n_nulls = max(1, int(len(df) * null_percentage / 100))  # At least 1 null
         n_nulls = min(n_nulls, len(df))  # Don't exceed available rows
         
         if pattern == 'random':
-            null_indices = np.random.choice(df.index, size=n_nulls, replace=False)
+            null_positions = self.rng.choice(len(df), size=n_nulls, replace=False)
         elif pattern == 'first_n':
-            null_indices = df.index[:n_nulls]
+            null_positions = slice(0, n_nulls)
         elif pattern == 'last_n':
-            null_indices = df.index[-n_nulls:]
+            null_positions = slice(len(df) - n_nulls, len(df))
         elif pattern == 'every_nth':
+            # Strided slice: no index array is materialized
             step = max(1, len(df) // n_nulls)
-            null_indices = df.index[::step][:n_nulls]
+            null_positions = slice(0, step * n_nulls, step)
         else:
             raise ValueError(f"Unknown pattern '{pattern}'. Use 'random', 'first_n', 'last_n', or 'every_nth'")
         
-        df_with_nulls.loc[null_indices, column] = np.nan
+        self._set_nulls(df_with_nulls, column, null_positions)
         return df_with_nulls
     
-    def save_sample(self, df: pd.DataFrame, name: str, description: str) -> Dict[str, Any]:
+    @staticmethod
+    def _set_nulls(df: pd.DataFrame, column: str, positions: Union[np.ndarray, slice]) -> None:
         """
-        Save sample in both Excel and CSV formats.
+        Null out the given row positions (array or slice) of a single column.
+        
+        Replaces the column with a masked copy, so a shallow-copied frame never
+        writes into the caller's data and no label-based .loc lookup is needed.
+        Series.mask upcasts dtypes the same way a NaN assignment would.
+        """
+        mask = np.zeros(len(df), dtype=bool)
+        mask[positions] = True
+        df[column] = df[column].mask(mask)
+    
+    def save_sample(self, df: pd.DataFrame, name: str, description: str,
+                    formats: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """
+        Save sample in the requested formats (CSV and/or Excel).
         
         Args:
             df: DataFrame to save
             name: Base name for the file
             description: Description of the sampling strategy
+            formats: Output formats ('csv', 'xlsx'); defaults to the generator's formats
         
         Returns:
-            Metadata about the saved files
+            Metadata about the saved files (one entry per written format)
+        """
+        return write_sample_files(self.output_dir, df, name, description,
+                                  formats or self.formats, pool=self.write_pool)
+    
+    def save_samples(self, samples: List[Tuple[pd.DataFrame, str, str]]) -> List[Dict[str, Any]]:
         """
-        # Ensure sample_data subdirectory exists
-        sample_dir = self.output_dir / "sample_data"
-        sample_dir.mkdir(exist_ok=True)
+        Save several samples, spreading them over worker processes when enabled.
         
-        # Save Excel version
-        excel_path = sample_dir / f"{name}.xlsx"
-        excel_checksum = StorageService.write_excel(df, excel_path)
-        excel_size = excel_path.stat().st_size
+        Samples are computed up front in this process (they share one seeded
+        generator); only the CPU-heavy serialization is parallelized.
         
-        # Save CSV version
-        csv_path = sample_dir / f"{name}.csv"
-        csv_checksum = StorageService.write_csv(df, csv_path)
-        csv_size = csv_path.stat().st_size
-        
-        print(f"  ✓ {name}.xlsx ({excel_size / 1024:.1f} KB)")
-        print(f"  ✓ {name}.csv ({csv_size / 1024:.1f} KB)")
-        
-        return {
-            "name": name,
-            "description": description,
-            "rows": len(df),
-            "columns": len(df.columns),
-            "excel": {
-                "path": str(excel_path.relative_to(self.output_dir)),
-                "size_bytes": excel_size,
-                "checksum": excel_checksum
-            },
-            "csv": {
-                "path": str(csv_path.relative_to(self.output_dir)),
-                "size_bytes": csv_size,
-                "checksum": csv_checksum
-            }
-        }
+        Args:
+            samples: (DataFrame, name, description) tuples
+        
+        Returns:
+            Metadata for each sample, in input order
+        """
+        if self.workers <= 1 or len(samples) <= 1:
+            return [self.save_sample(df, name, description) for df, name, description in samples]
+        
+        # spawn: forking while the writer pool's threads run is unsafe
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(samples)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(write_sample_files, self.output_dir, df, name, description, self.formats)
+                for df, name, description in samples
+            ]
+            return [future.result() for future in futures]
     
     def generate_all_fixtures(self) -> Dict[str, Any]:
         """
@@ -364,63 +560,50 @@ class TestFixtureGenerator:
             },
             "fixtures": []
         }
+        samples = []
         
         # 1. Random 20% sample
         print("\n1. Creating 20% random sample...")
         df_20pct = self.random_sample(20)
-        metadata["fixtures"].append(
-            self.save_sample(df_20pct, "sample_20pct", "20% random sample for general testing")
-        )
+        samples.append((df_20pct, "sample_20pct", "20% random sample for general testing"))
         
         # 2. Small 5% sample
         print("\n2. Creating 5% small sample...")
         df_small = self.random_sample(5)
-        metadata["fixtures"].append(
-            self.save_sample(df_small, "sample_small", "5% random sample for quick unit tests")
-        )
+        samples.append((df_small, "sample_small", "5% random sample for quick unit tests"))
         
         # 3. Time-balanced sample
         if self.time_column:
             print("\n3. Creating time-balanced sample...")
             df_time = self.time_balanced_sample(10)
-            metadata["fixtures"].append(
-                self.save_sample(df_time, "sample_time_balanced", 
-                               "All time periods with 10 rows each")
-            )
+            samples.append((df_time, "sample_time_balanced",
+                            "All time periods with 10 rows each"))
         
         # 4. Top entities sample
         if self.group_columns and self.value_columns:
             print("\n4. Creating top entities sample...")
             df_top = self.top_entities_sample(10)
-            metadata["fixtures"].append(
-                self.save_sample(df_top, "sample_top_entities", 
-                               "Top 10 entities by value with all their data")
-            )
+            samples.append((df_top, "sample_top_entities",
+                            "Top 10 entities by value with all their data"))
         
         # 5. Edge cases sample
         print("\n5. Creating edge cases sample...")
         df_edge = self.edge_cases_sample()
-        metadata["fixtures"].append(
-            self.save_sample(df_edge, "sample_edge_cases", 
-                           "Edge cases including nulls, extremes, and special characters")
-        )
+        samples.append((df_edge, "sample_edge_cases",
+                        "Edge cases including nulls, extremes, and special characters"))
         
         # 6. Stratified sample
         if self.group_columns:
             print("\n6. Creating stratified sample...")
             df_stratified = self.stratified_sample(15)
-            metadata["fixtures"].append(
-                self.save_sample(df_stratified, "sample_stratified", 
-                               "15% stratified sample maintaining group distribution")
-            )
+            samples.append((df_stratified, "sample_stratified",
+                            "15% stratified sample maintaining group distribution"))
         
         # 7. Sample with random nulls across columns
         print("\n7. Creating sample with random nulls...")
         df_with_nulls = self.add_random_nulls(self.random_sample(10), null_percentage=12)
-        metadata["fixtures"].append(
-            self.save_sample(df_with_nulls, "sample_with_nulls", 
-                           "10% sample with 12% random nulls across columns (excluding keys)")
-        )
+        samples.append((df_with_nulls, "sample_with_nulls",
+                        "10% sample with 12% random nulls across columns (excluding keys)"))
         
         # 8. Sample with nulls in single column (first value column if available)
         if self.value_columns:
@@ -430,15 +613,22 @@ class TestFixtureGenerator:
                 column=self.value_columns[0], 
                 null_percentage=25
             )
-            metadata["fixtures"].append(
-                self.save_sample(df_single_null, "sample_single_null_column", 
-                               f"8% sample with 25% nulls in '{self.value_columns[0]}' column")
-            )
+            samples.append((df_single_null, "sample_single_null_column",
+                            f"8% sample with 25% nulls in '{self.value_columns[0]}' column"))
+        
+        print(f"\nWriting {len(samples)} fixtures...")
+        metadata["fixtures"] = self.save_samples(samples)
         
         # Save metadata
         metadata_path = self.output_dir / "metadata.json"
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2, default=str)
+        if orjson is not None:
+            metadata_path.write_bytes(orjson.dumps(
+                metadata, default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            with open(metadata_path, "w") as f:
+                json.dump(metadata, f, indent=2, default=str)
         print(f"\n✓ Metadata saved to {metadata_path}")
         
         return metadata
@@ -466,6 +656,31 @@ def main():
         default=42,
         help="Random seed for reproducibility (default: 42)"
     )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "calamine", "openpyxl"],
+        default="auto",
+        help="Excel reader engine (default: auto - calamine if installed, else openpyxl)"
+    )
+    parser.add_argument(
+        "--formats",
+        default="csv",
+        help="Comma-separated output formats: csv, xlsx (default: csv; "
+             "use csv,xlsx to regenerate the Excel fixtures used by the test suite)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for writing fixtures (default: 1, in-process; "
+             "larger values use a spawn process pool, worth it for big fixtures only)"
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Cache the parsed source as Parquet next to the Excel file (default: on)"
+    )
     
     args = parser.parse_args()
     
@@ -478,15 +693,28 @@ def main():
         print(f"Error: Source file must be an Excel file (.xlsx or .xls)")
         return 1
     
-    # Generate fixtures
+    formats = tuple(f.strip().lower() for f in args.formats.split(",") if f.strip())
+    unknown = set(formats) - {"csv", "xlsx"}
+    if not formats or unknown:
+        print(f"Error: --formats must list csv and/or xlsx (got: {args.formats})")
+        return 1
+    
+    # Generate fixtures; Excel and CSV writes of a fixture are independent and
+    # IO-heavy, so a small thread pool overlaps them
     try:
-        generator = TestFixtureGenerator(
-            source_file=args.source_file,
-            output_dir=args.output_dir,
-            seed=args.seed
-        )
-        
-        metadata = generator.generate_all_fixtures()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="fixture-write") as pool:
+            generator = TestFixtureGenerator(
+                source_file=args.source_file,
+                output_dir=args.output_dir,
+                seed=args.seed,
+                engine=args.engine,
+                use_cache=args.cache,
+                formats=formats,
+                workers=args.workers,
+                write_pool=pool
+            )
+            
+            metadata = generator.generate_all_fixtures()
         
         print("\n" + "=" * 60)
         print("✅ Test fixtures generated successfully!")
@@ -13,6 +13,11 @@ import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 # Ensure project root is on sys.path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -22,6 +27,13 @@ from services.registry import DatasetRegistry
 from core.llm.executors import llm_executor
 
 
+def _read_json(path: Path):
+    """Parse a JSON file, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+
 def load_context(dataset_id: str):
     base = settings.datasets_path / dataset_id
     schema_path = base / "schema.json"
@@ -30,8 +42,8 @@ def load_context(dataset_id: str):
         raise FileNotFoundError(
             "Missing schema.json or analyses/concentration.json for dataset"
         )
-    schema = json.loads(schema_path.read_text())
-    analysis = json.loads(analysis_path.read_text())
+    schema = _read_json(schema_path)
+    analysis = _read_json(analysis_path)
     thresholds = analysis.get("thresholds") or [10, 20, 50]
     return schema, analysis, thresholds
 
@@ -46,26 +58,30 @@ async def run_demo(dataset_id: str, provider: str | None, model: str | None):
 
     schema, analysis, thresholds = load_context(dataset_id)
 
-    # Narrative
-    insights, s_ins = await llm_executor.generate_narrative_insights(
-        dataset_id, analysis, schema, thresholds, request_id="live-demo", model=model
+    # The three calls only read analysis/schema, so overlap their network latency
+    (insights, s_ins), (risk, s_risk), (thr, s_thr) = await asyncio.gather(
+        llm_executor.generate_narrative_insights(
+            dataset_id, analysis, schema, thresholds, request_id="live-demo", model=model
+        ),
+        llm_executor.generate_risk_flags(
+            dataset_id, analysis, request_id="live-demo", model=model
+        ),
+        llm_executor.generate_threshold_recommendations(
+            dataset_id, analysis, thresholds, request_id="live-demo", model=model
+        ),
     )
+
+    # Narrative
     print("\nNarrative Insights:")
     print(json.dumps(insights.model_dump(), indent=2)[:800])
     print(f"LLM used: {s_ins.used}, reason: {s_ins.reason or ''}")
 
     # Risk
-    risk, s_risk = await llm_executor.generate_risk_flags(
-        dataset_id, analysis, request_id="live-demo", model=model
-    )
     print("\nRisk Flags:")
     print(json.dumps(risk.model_dump(), indent=2))
     print(f"LLM used: {s_risk.used}, reason: {s_risk.reason or ''}")
 
     # Thresholds
-    thr, s_thr = await llm_executor.generate_threshold_recommendations(
-        dataset_id, analysis, thresholds, request_id="live-demo", model=model
-    )
     print("\nThreshold Recommendations:")
     print(json.dumps(thr.model_dump(), indent=2))
     print(f"LLM used: {s_thr.used}, reason: {s_thr.reason or ''}")
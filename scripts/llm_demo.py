@@ -6,25 +6,66 @@ Comprehensive demonstration of all LLM functions with real dataset testing.
 Shows provider switching, caching, usage tracking, and audit trails.
 """
 
+import argparse
 import asyncio
+import functools
 import json
 import sys
 import os
+import traceback
 from pathlib import Path
 from typing import Dict, Any, Optional
 import uuid
 
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import settings
-from services.registry import DatasetRegistry
-from services.llm_client import llm_client
-from core.llm.executors import llm_executor
-from core.llm.types import export_schemas
+from core.llm.types import LLMStatus, export_schemas
+
+
+def _truncated_json(obj: Any, limit: int = 200, indent: int = 2) -> str:
+    """Pretty-print obj as JSON, stopping once limit characters are produced."""
+    if orjson is not None and indent in (0, 2):
+        # One C-level pass is cheaper than streaming; trim to limit bytes
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        data = orjson.dumps(obj, default=str, option=option)
+        return data[:limit].decode(errors="ignore")
+
+    chunks = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=indent, default=str).iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(chunks)[:limit]
 
 
+@functools.lru_cache(maxsize=1)
+def _get_schemas() -> Dict[str, Any]:
+    """JSON schemas of the LLM response models, exported once per process."""
+    return export_schemas()
+
+
+def _schemas_json() -> str:
+    """All LLM function schemas as indented JSON text."""
+    if orjson is not None:
+        return orjson.dumps(_get_schemas(), option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(_get_schemas(), indent=2)
+
+
+# The sample payloads are constant: build them once and share them across
+# demos. Callers must treat the returned dicts as read-only.
+@functools.lru_cache(maxsize=1)
 def load_sample_data() -> Optional[Dict[str, Any]]:
     """Load sample concentration analysis results for testing."""
     # Sample data that mimics real concentration analysis output
@@ -58,6 +99,7 @@ def load_sample_data() -> Optional[Dict[str, Any]]:
     }
 
 
+@functools.lru_cache(maxsize=1)
 def load_sample_schema() -> Dict[str, Any]:
     """Load sample schema for testing."""
     return {
@@ -98,10 +140,46 @@ class LLMDemoRunner:
     """Comprehensive LLM demonstration runner."""
 
     def __init__(self):
-        self.demo_dataset_id = f"demo_{uuid.uuid4().hex[:8]}"
-        self.registry = DatasetRegistry()
-        self.request_id = f"demo_{uuid.uuid4().hex[:8]}"
+        # Caps concurrent demo calls to respect provider rate limits
+        self.llm_slots = asyncio.Semaphore(settings.llm_max_concurrency)
+
+    # Everything else is created on first use, so building a runner is cheap
+
+    @functools.cached_property
+    def demo_dataset_id(self) -> str:
+        return f"demo_{uuid.uuid4().hex[:8]}"
+
+    @functools.cached_property
+    def request_id(self) -> str:
+        return f"demo_{uuid.uuid4().hex[:8]}"
+
+    @functools.cached_property
+    def registry(self):
+        from services.registry import DatasetRegistry
+
+        return DatasetRegistry()
+
+    @functools.cached_property
+    def llm_client(self):
+        from services.llm_client import llm_client
+
+        return llm_client
+
+    @functools.cached_property
+    def executor(self):
+        from core.llm.executors import llm_executor
+
+        return llm_executor
+
+    @functools.cached_property
+    def demo_errors(self) -> tuple:
+        """Failures the executor can still raise; LLM errors become fallbacks."""
+        from core.llm.executors import LLMExecutionError
+
+        return (LLMExecutionError, OSError, asyncio.TimeoutError)
 
+    def _print_banner(self):
+        """Print the run configuration."""
         print("LLM Demo Starting")
         print(f" Demo Dataset ID: {self.demo_dataset_id}")
         print(f" Request ID: {self.request_id}")
@@ -116,17 +194,19 @@ class LLMDemoRunner:
         print(f" {title}")
         print("=" * 60)
 
-    def print_result(self, function_name: str, result: Any, status: Any):
+    def print_result(
+        self, function_name: str, result: BaseModel, status: LLMStatus
+    ):
         """Print formatted results."""
         print(f"\n {function_name.replace('_', ' ').title()} Results:")
-        print(f"   Status: {' Success' if status.get('used', False) else ' Fallback'}")
-        if status.get("model"):
-            print(f"   Model: {status['model']}")
-        if status.get("latency_ms"):
-            print(f"   Latency: {status['latency_ms']}ms")
-        if status.get("cached"):
-            print(f"   Cached: {' Yes' if status['cached'] else ' No'}")
-        print(f"   Data: {json.dumps(result, indent=2)[:200]}...")
+        print(f"   Status: {' Success' if status.used else ' Fallback'}")
+        if status.model:
+            print(f"   Model: {status.model}")
+        if status.latency_ms:
+            print(f"   Latency: {status.latency_ms}ms")
+        if status.cached:
+            print(f"   Cached: {' Yes' if status.cached else ' No'}")
+        print(f"   Data: {result.model_dump_json()[:200]}...")
 
     async def demo_schema_description(self):
         """Demonstrate schema description function."""
@@ -136,22 +216,19 @@ class LLMDemoRunner:
         dataset_stats = {"row_count": 5000, "column_count": 3}
 
         try:
-            result, status = await llm_executor.generate_schema_description(
+            result, status = await self.executor.generate_schema_description(
                 dataset_id=self.demo_dataset_id,
                 schema=schema,
                 dataset_stats=dataset_stats,
                 request_id=self.request_id,
             )
-
-            self.print_result(
-                "schema_description", result.model_dump(), status.model_dump()
-            )
-            return True
-
-        except Exception as e:
+        except self.demo_errors as e:
             print(f" Schema description failed: {e}")
             return False
 
+        self.print_result("schema_description", result, status)
+        return True
+
     async def demo_narrative_insights(self):
         """Demonstrate narrative insights function."""
         self.print_section("Narrative Insights")
@@ -161,23 +238,20 @@ class LLMDemoRunner:
         thresholds = [10, 20, 50]
 
         try:
-            result, status = await llm_executor.generate_narrative_insights(
+            result, status = await self.executor.generate_narrative_insights(
                 dataset_id=self.demo_dataset_id,
                 concentration_results=concentration_results,
                 schema=schema,
                 thresholds=thresholds,
                 request_id=self.request_id,
             )
-
-            self.print_result(
-                "narrative_insights", result.model_dump(), status.model_dump()
-            )
-            return True
-
-        except Exception as e:
+        except self.demo_errors as e:
             print(f" Narrative insights failed: {e}")
             return False
 
+        self.print_result("narrative_insights", result, status)
+        return True
+
     async def demo_risk_flags(self):
         """Demonstrate risk flags function."""
         self.print_section("Risk Assessment")
@@ -185,19 +259,18 @@ class LLMDemoRunner:
         concentration_results = load_sample_data()
 
         try:
-            result, status = await llm_executor.generate_risk_flags(
+            result, status = await self.executor.generate_risk_flags(
                 dataset_id=self.demo_dataset_id,
                 concentration_results=concentration_results,
                 request_id=self.request_id,
             )
-
-            self.print_result("risk_flags", result.model_dump(), status.model_dump())
-            return True
-
-        except Exception as e:
+        except self.demo_errors as e:
             print(f" Risk flags failed: {e}")
             return False
 
+        self.print_result("risk_flags", result, status)
+        return True
+
     async def demo_data_quality_report(self):
         """Demonstrate data quality report function."""
         self.print_section("Data Quality Report")
@@ -209,22 +282,19 @@ class LLMDemoRunner:
         ]
 
         try:
-            result, status = await llm_executor.generate_data_quality_report(
+            result, status = await self.executor.generate_data_quality_report(
                 dataset_id=self.demo_dataset_id,
                 schema=schema,
                 normalization_warnings=warnings,
                 request_id=self.request_id,
             )
-
-            self.print_result(
-                "data_quality_report", result.model_dump(), status.model_dump()
-            )
-            return True
-
-        except Exception as e:
+        except self.demo_errors as e:
             print(f" Data quality report failed: {e}")
             return False
 
+        self.print_result("data_quality_report", result, status)
+        return True
+
     async def demo_threshold_recommendations(self):
         """Demonstrate threshold recommendations function."""
         self.print_section("Threshold Recommendations")
@@ -233,22 +303,19 @@ class LLMDemoRunner:
         current_thresholds = [10, 20, 50]
 
         try:
-            result, status = await llm_executor.generate_threshold_recommendations(
+            result, status = await self.executor.generate_threshold_recommendations(
                 dataset_id=self.demo_dataset_id,
                 concentration_results=concentration_results,
                 current_thresholds=current_thresholds,
                 request_id=self.request_id,
             )
-
-            self.print_result(
-                "threshold_recommendations", result.model_dump(), status.model_dump()
-            )
-            return True
-
-        except Exception as e:
+        except self.demo_errors as e:
             print(f" Threshold recommendations failed: {e}")
             return False
 
+        self.print_result("threshold_recommendations", result, status)
+        return True
+
     async def demo_qa_over_context(self):
         """Demonstrate Q&A over context function."""
         self.print_section("Q&A Over Context")
@@ -261,28 +328,26 @@ class LLMDemoRunner:
             "What is the concentration risk level?",
         ]
 
-        success_count = 0
-        for question in questions:
-            print(f"\nQuestion: {question}")
-            try:
-                result, status = await llm_executor.answer_question(
-                    dataset_id=self.demo_dataset_id,
-                    user_question=question,
-                    context=context,
-                    request_id=self.request_id,
-                )
-
-                print(f"   Answer: {result.answer}")
-                print(f"   Status: {'Success' if status.used else 'Fallback'}")
-                if result.citations:
-                    print(f"   Citations: {result.citations}")
-
-                success_count += 1
+        # One request for all questions: the context is sent once
+        try:
+            result, status = await self.executor.answer_questions_batch(
+                dataset_id=self.demo_dataset_id,
+                questions=questions,
+                context=context,
+                request_id=self.request_id,
+            )
+        except self.demo_errors as e:
+            print(f" Q&A failed: {e}")
+            return False
 
-            except Exception as e:
-                print(f" Q&A failed for question: {e}")
+        print(f"   Status: {'Success' if status.used else 'Fallback'}")
+        for answer in result.answers:
+            print(f"\nQuestion: {answer.question}")
+            print(f"   Answer: {answer.answer}")
+            if answer.citations:
+                print(f"   Citations: {answer.citations}")
 
-        return success_count > 0
+        return len(result.answers) > 0
 
     async def demo_full_insights(self):
         """Demonstrate full insights generation."""
@@ -293,44 +358,43 @@ class LLMDemoRunner:
         thresholds = [10, 20, 50]
 
         try:
-            result = await llm_executor.generate_full_insights(
+            result = await self.executor.generate_full_insights(
                 dataset_id=self.demo_dataset_id,
                 concentration_results=concentration_results,
                 schema=schema,
                 thresholds=thresholds,
                 request_id=self.request_id,
             )
+        except self.demo_errors as e:
+            print(f" Full insights failed: {e}")
+            return False
 
-            print("Full Insights Generated:")
-            print(f"   Overall Status: {result['overall_llm_status']}")
-            print(f"   Generated At: {result['generated_at']}")
+        print("Full Insights Generated:")
+        print(f"   Overall Status: {result['overall_llm_status']}")
+        print(f"   Generated At: {result['generated_at']}")
 
-            for insight_type, insight_data in result.items():
-                if isinstance(insight_data, dict) and "llm_status" in insight_data:
-                    status = insight_data["llm_status"]
-                    print(
-                        f"   {insight_type}: {'Used' if status.get('used') else 'Skipped'}"
-                    )
+        for insight_type, insight_data in result.items():
+            if isinstance(insight_data, dict) and "llm_status" in insight_data:
+                status = insight_data["llm_status"]
+                print(
+                    f"   {insight_type}: {'Used' if status.get('used') else 'Skipped'}"
+                )
 
-            return True
-
-        except Exception as e:
-            print(f" Full insights failed: {e}")
-            return False
+        return True
 
     def demo_usage_tracking(self):
         """Demonstrate usage tracking and caching."""
         self.print_section("Usage Tracking & Caching")
 
         # Get usage stats
-        stats = llm_client.get_usage_stats(self.demo_dataset_id)
+        stats = self.llm_client.get_usage_stats(self.demo_dataset_id)
         print(f" Usage Statistics:")
         print(f"   Dataset: {stats.get('dataset_id', 'N/A')}")
         print(f"   Calls Made: {stats.get('calls_made', 0)}")
         print(f"   Max Calls: {stats.get('max_calls', 0)}")
 
         # Get overall stats
-        overall_stats = llm_client.get_usage_stats()
+        overall_stats = self.llm_client.get_usage_stats()
         print(f" Overall Statistics:")
         print(f"   Total Datasets: {overall_stats.get('total_datasets', 0)}")
         print(f"   Total Calls: {overall_stats.get('total_calls', 0)}")
@@ -357,14 +421,21 @@ class LLMDemoRunner:
             llm_path = dataset_path / "llm"
 
             if llm_path.exists():
-                artifacts = list(llm_path.glob("*.json"))
+                # scandir reuses the directory entry type; no Path per artifact
+                with os.scandir(llm_path) as entries:
+                    artifacts = [
+                        entry.name
+                        for entry in entries
+                        if entry.name.endswith(".json")
+                        and entry.is_file(follow_symlinks=False)
+                    ]
                 print(f" LLM Artifacts: {len(artifacts)}")
-                for artifact in artifacts[:3]:  # Show first 3
-                    print(f"   - {artifact.name}")
+                for name in artifacts[:3]:  # Show first 3
+                    print(f"   - {name}")
             else:
                 print(" No LLM artifacts found")
 
-        except Exception as e:
+        except (OSError, ValueError) as e:
             print(f" Audit trail demo failed: {e}")
 
     def demo_json_schemas(self):
@@ -372,23 +443,36 @@ class LLMDemoRunner:
         self.print_section("JSON Schema Export")
 
         try:
-            schemas = export_schemas()
-            print("Available LLM Function Schemas:")
-            for name, schema in schemas.items():
-                print(f"   - {name}: {len(schema.get('properties', {}))} properties")
-
-            # Show example schema
-            if schemas:
-                example_name = list(schemas.keys())[0]
-                example_schema = schemas[example_name]
-                print(f"\nExample Schema ({example_name}):")
-                print(json.dumps(example_schema, indent=2)[:300] + "...")
-
-        except Exception as e:
+            schemas = _get_schemas()
+        except (TypeError, ValueError) as e:  # pydantic schema generation errors
             print(f"❌ Schema export failed: {e}")
+            return
+
+        print("Available LLM Function Schemas:")
+        for name, schema in schemas.items():
+            print(f"   - {name}: {len(schema.get('properties', {}))} properties")
+
+        # Show example schema
+        if schemas:
+            example_name = list(schemas.keys())[0]
+            example_schema = schemas[example_name]
+            print(f"\nExample Schema ({example_name}):")
+            print(_truncated_json(example_schema, 300) + "...")
+
+    async def _run_demo(self, name: str, demo_func) -> bool:
+        """Run one demo under the concurrency limit; failures don't cancel siblings."""
+        async with self.llm_slots:
+            try:
+                return await demo_func()
+            except Exception as e:
+                print(f"{name} demo failed completely: {e}")
+                if settings.debug:
+                    traceback.print_exc()
+                return False
 
     async def run_comprehensive_demo(self):
         """Run the complete demonstration."""
+        self._print_banner()
         print("Starting Comprehensive LLM Demonstration")
 
         # Create demo dataset for tracking
@@ -408,14 +492,12 @@ class LLMDemoRunner:
             ("Full Insights", self.demo_full_insights),
         ]
 
-        results = {}
-        for name, demo_func in demos:
-            try:
-                success = await demo_func()
-                results[name] = success
-            except Exception as e:
-                print(f"{name} demo failed completely: {e}")
-                results[name] = False
+        # Demos are independent and network-bound, so run them concurrently
+        # (section output may interleave)
+        outcomes = await asyncio.gather(
+            *(self._run_demo(name, demo_func) for name, demo_func in demos)
+        )
+        results = dict(zip((name for name, _ in demos), outcomes))
 
         # Run sync demos
         self.demo_usage_tracking()
@@ -446,23 +528,15 @@ class LLMDemoRunner:
         print(f"   - Review logs for detailed error information")
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) > 1 and sys.argv[1] == "--help":
-        print("LLM Demo Script")
-        print("Usage: python scripts/llm_demo.py [--help] [--schemas-only]")
-        print("")
-        print("Options:")
-        print("  --help        Show this help message")
-        print("  --schemas-only Export JSON schemas only")
-        sys.exit(0)
-
-    if len(sys.argv) > 1 and sys.argv[1] == "--schemas-only":
-        runner = LLMDemoRunner()
-        runner.demo_json_schemas()
-        sys.exit(0)
-
-    # Run full demo
+def print_schemas():
+    """Print the LLM function schemas as JSON (never loads the LLM client stack)."""
+    print(_schemas_json())
+
+
+def run_demo():
+    """Run the full demo; repeat runs replay identical requests from disk."""
+    if settings.llm_response_cache_dir is None:
+        settings.llm_response_cache_dir = settings.storage_base_path / "llm_cache"
     runner = LLMDemoRunner()
 
     try:
@@ -474,5 +548,28 @@ def main():
         sys.exit(1)
 
 
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="LLM demo script")
+    parser.add_argument(
+        "--schemas-only",
+        action="store_true",
+        help="Export JSON schemas only (same as the 'schemas' command)",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Run all LLM demos (default)").set_defaults(
+        func=run_demo
+    )
+    commands.add_parser("schemas", help="Export JSON schemas only").set_defaults(
+        func=print_schemas
+    )
+    args = parser.parse_args()
+
+    if args.schemas_only:
+        print_schemas()
+    else:
+        getattr(args, "func", run_demo)()
+
+
 if __name__ == "__main__":
     main()
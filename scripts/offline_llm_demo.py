@@ -3,19 +3,29 @@
 Offline LLM Demo (Read-only)
 
 - Reads deterministic artifacts from storage/datasets/mock_data
+- Replays stored LLM artifacts from mock_data/llm when present (no provider call)
 - If LLM keys are present and providers work, prints real outputs
 - Otherwise prints graceful fallbacks
 - Does NOT write any artifacts by default
 
 Optional: --refresh-artifacts (only if providers succeed) to write new LLM artifacts into mock_data/llm
+Optional: --response-cache to replay identical provider requests from (and write them to) storage/llm_cache
 """
 
 import argparse
 import asyncio
+import functools
 import json
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
+from pydantic import ValidationError
+
 # Ensure project root is on sys.path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -23,6 +33,7 @@ sys.path.insert(0, str(project_root))
 from config.settings import settings
 from services.registry import DatasetRegistry
 from core.llm.executors import llm_executor
+from core.llm.types import LLM_FUNCTION_MODELS, LLMStatus
 from services.llm_client import llm_client
 
 
@@ -31,15 +42,65 @@ DATASETS = Path("storage/datasets")
 MOCK_PATH = DATASETS / MOCK_ID
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_json(path: str, mtime_ns: int):
+    """Parse a JSON file once per (path, mtime); callers must not mutate the result."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_json(path: Path):
+    """Memoized JSON read that is invalidated when the file changes."""
+    return _parse_json(str(path), path.stat().st_mtime_ns)
+
+
 def load_mock_context():
     schema_path = MOCK_PATH / "schema.json"
     analysis_path = MOCK_PATH / "analyses" / "concentration.json"
-    schema = json.loads(schema_path.read_text()) if schema_path.exists() else {}
-    analysis = json.loads(analysis_path.read_text()) if analysis_path.exists() else {}
+    schema = _read_json(schema_path) if schema_path.exists() else {}
+    analysis = _read_json(analysis_path) if analysis_path.exists() else {}
     thresholds = analysis.get("thresholds") or [10, 20, 50]
     return schema, analysis, thresholds
 
 
+def _load_cached_result(dataset_id: str, fn_name: str):
+    """
+    Latest successful stored artifact for fn_name as (result, status), or None.
+
+    Artifacts are validated on load; one written under an older schema counts
+    as missing.
+    """
+    llm_path = DATASETS / dataset_id / "llm"
+    if not llm_path.exists():
+        return None
+
+    # Artifacts are named {fn_name}_{unix_ts}; failed ones {fn_name}_failed_{ts}
+    prefix = f"{fn_name}_"
+    stamps = [
+        int(path.stem[len(prefix) :])
+        for path in llm_path.glob(f"{prefix}*.json")
+        if path.stem[len(prefix) :].isdigit()
+    ]
+    if not stamps:
+        return None
+
+    artifact = _read_json(llm_path / f"{prefix}{max(stamps)}.json")
+    if artifact.get("error") or not artifact.get("response"):
+        return None
+
+    try:
+        result = LLM_FUNCTION_MODELS[fn_name].model_validate(artifact["response"])
+    except ValidationError:
+        return None
+
+    status = LLMStatus(
+        used=False, reason="cached", model=artifact.get("model"), cached=True
+    )
+    return result, status
+
+
 async def run_demo(refresh_artifacts: bool = False):
     # Smoke test providers (visibility into fallback readiness)
     print("Provider connectivity (smoke test):")
@@ -48,29 +109,34 @@ async def run_demo(refresh_artifacts: bool = False):
         "gemini": "gemini-flash",
         "anthropic": "claude-3.5-haiku",
     }
-    any_ok = False
-    for prov, friendly_model in provider_models.items():
+    messages = [
+        {"role": "system", "content": 'Return exactly {"ok": true} as JSON.'},
+        {"role": "user", "content": 'Return only {"ok": true}.'},
+    ]
+    configured = [prov for prov in provider_models if prov in llm_client._clients]
+    for prov in provider_models:
         if prov not in llm_client._clients:
             print(f"  {prov}: not configured")
-            continue
-        try:
-            # Temporary provider switch
-            old_provider = settings.llm_provider
-            settings.llm_provider = prov
-            messages = [
-                {"role": "system", "content": 'Return exactly {"ok": true} as JSON.'},
-                {"role": "user", "content": 'Return only {"ok": true}.'},
-            ]
-            resp, _ = await llm_client.chat_json(
-                messages=messages, model=friendly_model
+
+    # Probe all configured providers at once; provider is passed per call
+    probes = await asyncio.gather(
+        *(
+            llm_client.chat_json(
+                messages=messages, model=provider_models[prov], provider=prov
             )
-            ok = isinstance(resp, dict) and resp.get("ok") is True
-            print(f"  {prov}: {'OK' if ok else 'unexpected response'}")
-            any_ok = any_ok or ok
-        except Exception as e:
-            print(f"  {prov}: failed ({str(e)[:120]})")
-        finally:
-            settings.llm_provider = old_provider
+            for prov in configured
+        ),
+        return_exceptions=True,
+    )
+    any_ok = False
+    for prov, probe in zip(configured, probes):
+        if isinstance(probe, Exception):
+            print(f"  {prov}: failed ({str(probe)[:120]})")
+            continue
+        resp, _ = probe
+        ok = isinstance(resp, dict) and resp.get("ok") is True
+        print(f"  {prov}: {'OK' if ok else 'unexpected response'}")
+        any_ok = any_ok or ok
 
     print("Offline LLM Demo (read-only)")
     print(f"Dataset: {MOCK_ID}")
@@ -85,8 +151,11 @@ async def run_demo(refresh_artifacts: bool = False):
         return 1
 
     # Try all LLM functions, but do not write artifacts unless refresh_artifacts and success
+    # (stored artifacts are replayed first, except when a refresh is requested)
+    use_cache = not refresh_artifacts
     # Narrative Insights
-    insights, s_ins = await llm_executor.generate_narrative_insights(
+    cached = use_cache and _load_cached_result(MOCK_ID, "narrative_insights")
+    insights, s_ins = cached or await llm_executor.generate_narrative_insights(
         dataset_id=MOCK_ID,
         concentration_results=analysis,
         schema=schema,
@@ -94,28 +163,30 @@ async def run_demo(refresh_artifacts: bool = False):
         request_id="offline-demo",
     )
     print("\nNarrative Insights:")
-    print(json.dumps(insights.model_dump(), indent=2)[:800])
+    print(insights.model_dump_json(indent=2)[:800])
     print(f"LLM used: {s_ins.used}, reason: {s_ins.reason or ''}")
 
     # Risk
-    risk, s_risk = await llm_executor.generate_risk_flags(
+    cached = use_cache and _load_cached_result(MOCK_ID, "risk_flags")
+    risk, s_risk = cached or await llm_executor.generate_risk_flags(
         dataset_id=MOCK_ID,
         concentration_results=analysis,
         request_id="offline-demo",
     )
     print("\nRisk Flags:")
-    print(json.dumps(risk.model_dump(), indent=2))
+    print(risk.model_dump_json(indent=2))
     print(f"LLM used: {s_risk.used}, reason: {s_risk.reason or ''}")
 
     # Thresholds
-    thresh, s_thr = await llm_executor.generate_threshold_recommendations(
+    cached = use_cache and _load_cached_result(MOCK_ID, "threshold_recommendations")
+    thresh, s_thr = cached or await llm_executor.generate_threshold_recommendations(
         dataset_id=MOCK_ID,
         concentration_results=analysis,
         current_thresholds=thresholds,
         request_id="offline-demo",
     )
     print("\nThreshold Recommendations:")
-    print(json.dumps(thresh.model_dump(), indent=2))
+    print(thresh.model_dump_json(indent=2))
     print(f"LLM used: {s_thr.used}, reason: {s_thr.reason or ''}")
 
     # Only write artifacts if explicitly requested and at least one call used LLM
@@ -137,7 +208,15 @@ def main():
         action="store_true",
         help="Write new artifacts to mock_data/llm if LLM calls succeed",
     )
+    parser.add_argument(
+        "--response-cache",
+        action="store_true",
+        help="Replay identical provider requests from storage/llm_cache, writing new responses there",
+    )
     args = parser.parse_args()
+    # The on-disk response cache writes files, so it is opt-in for this read-only demo
+    if args.response_cache and settings.llm_response_cache_dir is None:
+        settings.llm_response_cache_dir = settings.storage_base_path / "llm_cache"
     raise SystemExit(asyncio.run(run_demo(args.refresh_artifacts)))
 
 
@@ -2,6 +2,11 @@
 Custom exceptions for service layer operations.
 """
 
+# Default message templates, formatted only when no message is given
+_DATASET_NOT_FOUND = "Dataset %s not found"
+_OPERATION_FAILED = "Failed to %s dataset %s"
+_SCHEMA_NOT_FOUND = "Schema not found for dataset %s"
+
 
 class DatasetNotFoundError(Exception):
     """Raised when a requested dataset does not exist."""
@@ -9,7 +14,7 @@ class DatasetNotFoundError(Exception):
     def __init__(self, dataset_id: str, message: str = None):
         self.dataset_id = dataset_id
         if message is None:
-            message = f"Dataset {dataset_id} not found"
+            message = _DATASET_NOT_FOUND % dataset_id
         super().__init__(message)
 
 
@@ -20,7 +25,7 @@ class DatasetOperationError(Exception):
         self.dataset_id = dataset_id
         self.operation = operation
         if message is None:
-            message = f"Failed to {operation} dataset {dataset_id}"
+            message = _OPERATION_FAILED % (operation, dataset_id)
         super().__init__(message)
 
 
@@ -30,5 +35,5 @@ class SchemaNotFoundError(Exception):
     def __init__(self, dataset_id: str, message: str = None):
         self.dataset_id = dataset_id
         if message is None:
-            message = f"Schema not found for dataset {dataset_id}"
+            message = _SCHEMA_NOT_FOUND % dataset_id
         super().__init__(message)
@@ -3,11 +3,49 @@ Export Service
 Handles exporting analysis results to various formats.
 """
 
-import pandas as pd
-from typing import Dict, Any, List
+import csv
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import json
-from services.storage import StorageService
+
+# pandas (and StorageService, which imports it) load only when a workbook is
+# built, so CSV/JSON exports never pay the pandas import
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
+__all__ = ["ExportService", "CSV_COLUMNS", "FAST_EXCEL_MIN_ROWS"]
+
+logger = logging.getLogger(__name__)
+
+# Long-format concentration CSV layout: one row per period x threshold
+CSV_COLUMNS = ["period", "threshold", "count", "value", "pct_of_total"]
+
+# Formula-free workbooks with more detail rows than this use the streaming writer
+FAST_EXCEL_MIN_ROWS = 10_000
+
+
+@lru_cache(maxsize=64)
+def _parse_threshold(threshold_key: str) -> Union[int, str]:
+    """Map a "top_N" key to N (int), or the stripped key if it isn't numeric."""
+    threshold_display = threshold_key.replace("top_", "")
+    try:
+        return int(threshold_display)
+    except ValueError:
+        return threshold_display
+
+
+@lru_cache(maxsize=64)
+def _threshold_order(threshold_key: str) -> int:
+    """Numeric sort key for a "top_N" threshold key."""
+    return int(threshold_key.split("_")[1]) if "_" in threshold_key else 0
 
 
 class ExportService:
@@ -26,76 +64,12 @@ class ExportService:
             Path to exported file
         """
         # Build a standard single-table CSV to remain parser-friendly
-        # Supports both legacy shape (top_10 keys at period root) and new shape (concentration dict)
-        rows: List[Dict[str, Any]] = []
-
-        def _append_rows_for_period(period_label: str, payload: Dict[str, Any]):
-            # Preferred: nested concentration dict from analyzer
-            concentration = payload.get("concentration")
-            if isinstance(concentration, dict) and concentration:
-                # Sort thresholds by numeric value for deterministic order
-                sorted_keys = sorted(
-                    concentration.keys(),
-                    key=lambda x: int(x.split("_")[1]) if "_" in x else 0,
-                )
-                for threshold_key in sorted_keys:
-                    metrics = concentration[threshold_key]
-                    if isinstance(metrics, dict):
-                        threshold_display = threshold_key.replace("top_", "")
-                        try:
-                            threshold_value = int(threshold_display)
-                        except Exception:
-                            threshold_value = threshold_display
-                        rows.append(
-                            {
-                                "period": period_label,
-                                "threshold": threshold_value,
-                                "count": metrics.get("count", 0),
-                                "value": metrics.get("value", 0),
-                                "pct_of_total": round(
-                                    metrics.get(
-                                        "percentage", metrics.get("pct_of_total", 0)
-                                    ),
-                                    1,
-                                ),
-                            }
-                        )
-                return
-
-            # Fallback: legacy top_* keys on the period dict
-            for key, metrics in payload.items():
-                if isinstance(metrics, dict) and str(key).startswith("top_"):
-                    threshold_display = str(key).replace("top_", "")
-                    try:
-                        threshold_value = int(threshold_display)
-                    except Exception:
-                        threshold_value = threshold_display
-                    rows.append(
-                        {
-                            "period": period_label,
-                            "threshold": threshold_value,
-                            "count": metrics.get("count", 0),
-                            "value": metrics.get("value", 0),
-                            "pct_of_total": round(
-                                metrics.get(
-                                    "pct_of_total", metrics.get("percentage", 0)
-                                ),
-                                1,
-                            ),
-                        }
-                    )
-
-        # by_period entries
-        for period_data in results.get("by_period", []) or []:
-            period = period_data.get("period", "TOTAL")
-            _append_rows_for_period(period, period_data)
-
-        # totals fallback for single-period datasets
-        if not rows and isinstance(results.get("totals"), dict):
-            _append_rows_for_period("TOTAL", results["totals"])
-
-        df = pd.DataFrame(rows)
-        return StorageService.write_csv(df, output_path)
+        # Rows are written as they are produced; no intermediate DataFrame
+        with open(output_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(ExportService._iter_csv_rows(results))
+        return str(output_path)
 
     @staticmethod
     def export_concentration_excel(
@@ -112,126 +86,235 @@ class ExportService:
         Returns:
             Path to exported file
         """
-        sheets = {}
+        from services.storage import StorageService
 
-        # Summary sheet
-        summary_rows: List[Dict[str, Any]] = []
-        if results.get("by_period"):
-            for period_data in results["by_period"]:
-                row: Dict[str, Any] = {
-                    "period": period_data.get("period"),
-                    "total": period_data.get("total", 0),
-                }
-                # Preferred: nested concentration dict
-                concentration = period_data.get("concentration")
-                if isinstance(concentration, dict) and concentration:
-                    # Sort thresholds by numeric value for deterministic column order
-                    sorted_keys = sorted(
-                        concentration.keys(),
-                        key=lambda x: int(x.split("_")[1]) if "_" in x else 0,
-                    )
-                    for threshold_key in sorted_keys:
-                        metrics = concentration[threshold_key]
-                        if isinstance(metrics, dict):
-                            row[f"{threshold_key}_count"] = metrics.get("count", 0)
-                            row[f"{threshold_key}_value"] = metrics.get("value", 0)
-                            row[f"{threshold_key}_pct"] = round(
-                                metrics.get(
-                                    "percentage", metrics.get("pct_of_total", 0)
-                                ),
-                                1,
-                            )
-                else:
-                    # Fallback: legacy top_* keys on the period dict
-                    for key, metrics in period_data.items():
-                        if isinstance(metrics, dict) and str(key).startswith("top_"):
-                            row[f"{key}_count"] = metrics.get("count", 0)
-                            row[f"{key}_value"] = metrics.get("value", 0)
-                            row[f"{key}_pct"] = round(
-                                metrics.get(
-                                    "pct_of_total", metrics.get("percentage", 0)
-                                ),
-                                1,
-                            )
-                summary_rows.append(row)
-        elif isinstance(results.get("totals"), dict):
-            # Handle single-period case (no time dimension)
-            totals_data = results["totals"]
-            row = {"period": "TOTAL", "total": totals_data.get("total", 0)}
-            concentration = totals_data.get("concentration", {})
-            if isinstance(concentration, dict) and concentration:
-                # Sort thresholds by numeric value for deterministic column order
-                sorted_keys = sorted(
-                    concentration.keys(),
-                    key=lambda x: int(x.split("_")[1]) if "_" in x else 0,
-                )
-                for threshold_key in sorted_keys:
-                    metrics = concentration[threshold_key]
-                    if isinstance(metrics, dict):
-                        row[f"{threshold_key}_count"] = metrics.get("count", 0)
-                        row[f"{threshold_key}_value"] = metrics.get("value", 0)
-                        row[f"{threshold_key}_pct"] = round(
-                            metrics.get("percentage", metrics.get("pct_of_total", 0)), 1
-                        )
-            else:
-                for key, metrics in totals_data.items():
-                    if isinstance(metrics, dict) and str(key).startswith("top_"):
-                        row[f"{key}_count"] = metrics.get("count", 0)
-                        row[f"{key}_value"] = metrics.get("value", 0)
-                        row[f"{key}_pct"] = round(
-                            metrics.get("pct_of_total", metrics.get("percentage", 0)), 1
-                        )
-            summary_rows.append(row)
-
-        if summary_rows:
-            sheets["Summary"] = pd.DataFrame(summary_rows)
-
-        # Details sheet (if available)
-        if "details" in results:
-            sheets["Details"] = pd.DataFrame(results["details"])
-
-        # Head samples sheet - show top entities for each period
-        head_sample_rows = []
-        if "by_period" in results and len(results["by_period"]) > 0:
-            for period_data in results["by_period"]:
-                period = period_data["period"]
-                head_sample = period_data.get("head_sample", [])
-                for i, entity in enumerate(
-                    head_sample[:10]
-                ):  # Limit to top 10 for readability
-                    row = entity.copy()
-                    row["period"] = period
-                    row["rank"] = i + 1
-                    head_sample_rows.append(row)
-        elif "totals" in results:
-            # Single period case
-            totals_data = results["totals"]
-            head_sample = totals_data.get("head_sample", [])
-            for i, entity in enumerate(head_sample[:10]):
-                row = entity.copy()
-                row["period"] = "TOTAL"
-                row["rank"] = i + 1
-                head_sample_rows.append(row)
-
-        if head_sample_rows:
-            sheets["Top_Entities"] = pd.DataFrame(head_sample_rows)
-
-        # Parameters sheet
-        params_data = {
-            "Parameter": ["Group By", "Value Column", "Time Column", "Thresholds"],
-            "Value": [
-                results.get("group_by", ""),
-                results.get("value_column", ""),
-                results.get("time_column", "none"),
-                str(results.get("thresholds", [10, 20, 50])),
-            ],
+        builders = {
+            "Summary": ExportService._build_summary,
+            "Details": ExportService._build_details,
+            "Top_Entities": ExportService._build_top_entities,
+            "Parameters": ExportService._build_parameters,
         }
-        sheets["Parameters"] = pd.DataFrame(params_data)
+        if len(results.get("details") or ()) > FAST_EXCEL_MIN_ROWS:
+            # Builders read disjoint parts of results; overlap them when the
+            # Details frame is large enough to be worth a thread pool
+            with ThreadPoolExecutor(max_workers=len(builders)) as pool:
+                futures = {
+                    name: pool.submit(build, results)
+                    for name, build in builders.items()
+                }
+                frames = {name: future.result() for name, future in futures.items()}
+        else:
+            frames = {name: build(results) for name, build in builders.items()}
+        sheets = {name: frame for name, frame in frames.items() if frame is not None}
 
+        detail_rows = len(sheets.get("Details", ()))
+        if not include_formulas and detail_rows > FAST_EXCEL_MIN_ROWS:
+            return StorageService.write_excel_fast(sheets, output_path)
         return StorageService.write_excel(
             sheets, output_path, with_formulas=include_formulas
         )
 
+    @staticmethod
+    def _build_summary(results: Dict[str, Any]) -> Optional["pd.DataFrame"]:
+        """Summary sheet: one wide row per period, or None if there are no periods."""
+        import pandas as pd
+
+        # Producers may publish the rows pre-flattened
+        pct_key = ExportService._pct_key(results)
+        summary_rows = results.get("by_period_flat") or [
+            ExportService.summary_row(period, payload, pct_key)
+            for period, payload in ExportService._periods(results)
+        ]
+        return pd.DataFrame(summary_rows) if summary_rows else None
+
+    @staticmethod
+    def _build_details(results: Dict[str, Any]) -> Optional["pd.DataFrame"]:
+        """Details sheet, if the results carry detail records."""
+        if "details" not in results:
+            return None
+        return ExportService._details_frame(results)
+
+    @staticmethod
+    def _build_top_entities(results: Dict[str, Any]) -> Optional["pd.DataFrame"]:
+        """Top_Entities sheet: up to 10 head_sample entities per period."""
+        import pandas as pd
+
+        records: List[Dict[str, Any]] = []
+        labels: List[Any] = []
+        ranks: List[int] = []
+        for period, payload in ExportService._periods(results):
+            top = payload.get("head_sample", [])[:10]  # Top 10 for readability
+            records.extend(top)
+            labels.extend([period] * len(top))
+            ranks.extend(range(1, len(top) + 1))
+
+        if not records:
+            return None
+        # Entities are not copied; period/rank are added as whole columns
+        return pd.DataFrame.from_records(records).assign(period=labels, rank=ranks)
+
+    @staticmethod
+    def _build_parameters(results: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """Parameters sheet: the analysis configuration, as header + row tuples."""
+        # Spreadsheet-friendly "10,20,50" rather than Python list syntax
+        thresholds = results.get("thresholds", [10, 20, 50])
+        return [
+            ("Parameter", "Value"),
+            ("Group By", results.get("group_by", "")),
+            ("Value Column", results.get("value_column", "")),
+            ("Time Column", results.get("time_column", "none")),
+            ("Thresholds", ",".join(map(str, thresholds))),
+        ]
+
+    @staticmethod
+    def _details_frame(results: Dict[str, Any]) -> "pd.DataFrame":
+        """
+        Build the Details sheet frame, using results["details_schema"] when present.
+
+        The schema ({"columns": [...], "dtypes": {...}}) fixes the column order and
+        dtypes up front instead of inferring them from every record.
+        """
+        import pandas as pd
+
+        schema = results.get("details_schema")
+        if not schema:
+            # Details are at most a few rows per period; inference is cheap
+            return pd.DataFrame(results["details"])
+        frame = pd.DataFrame.from_records(results["details"], columns=schema["columns"])
+        try:
+            return frame.astype(schema.get("dtypes", {}), copy=False)
+        except (ValueError, TypeError):
+            logger.warning(
+                "Concentration export details_schema does not fit the details; "
+                "inferring Details dtypes"
+            )
+            return pd.DataFrame(results["details"])
+
+    @staticmethod
+    def _periods(results: Dict[str, Any]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+        """
+        Yield (period, payload) for each period, or ("TOTAL", totals) for
+        single-period results without a time dimension.
+        """
+        by_period = results.get("by_period")
+        if by_period:
+            yield from ((payload.get("period"), payload) for payload in by_period)
+        elif isinstance(results.get("totals"), dict):
+            yield ("TOTAL", results["totals"])
+
+    @staticmethod
+    def _pct_key(results: Dict[str, Any]) -> str:
+        """
+        Name of the percentage field used by this results payload.
+
+        The analyzer emits "percentage"; legacy payloads use "pct_of_total". The
+        first threshold metric found decides for the whole payload, preferring
+        the field native to its shape when both are present.
+        """
+        for _, payload in ExportService._periods(results):
+            concentration = payload.get("concentration")
+            if isinstance(concentration, dict) and concentration:
+                candidates = concentration.values()
+                preferred, other = "percentage", "pct_of_total"
+            else:
+                candidates = (
+                    metrics
+                    for key, metrics in payload.items()
+                    if str(key).startswith("top_")
+                )
+                preferred, other = "pct_of_total", "percentage"
+            for metrics in candidates:
+                if isinstance(metrics, dict):
+                    return preferred if preferred in metrics else other
+        return "percentage"
+
+    @staticmethod
+    def _threshold_metrics(
+        payload: Dict[str, Any], pct_key: str
+    ) -> List[Tuple[str, Dict[str, Any], float]]:
+        """
+        List (threshold_key, metrics, pct) for each threshold in a period payload.
+
+        Prefers the nested concentration dict from the analyzer (thresholds sorted
+        numerically); falls back to legacy top_* keys at the period root. pct is
+        read from pct_key, as returned by _pct_key for the enclosing results.
+        """
+        concentration = payload.get("concentration")
+        if isinstance(concentration, dict) and concentration:
+            # Sort thresholds by numeric value for deterministic order
+            sorted_keys = sorted(concentration.keys(), key=_threshold_order)
+            return [
+                (key, concentration[key], concentration[key].get(pct_key, 0))
+                for key in sorted_keys
+                if isinstance(concentration[key], dict)
+            ]
+
+        return [
+            (str(key), metrics, metrics.get(pct_key, 0))
+            for key, metrics in payload.items()
+            if isinstance(metrics, dict) and str(key).startswith("top_")
+        ]
+
+    @staticmethod
+    def _iter_csv_rows(results: Dict[str, Any]) -> Iterator[Tuple]:
+        """
+        Yield one CSV_COLUMNS tuple per (period, threshold).
+
+        Supports both legacy shape (top_10 keys at period root) and new shape
+        (concentration dict); totals are used when by_period yields no rows.
+        """
+        pct_key = ExportService._pct_key(results)
+        emitted = False
+        for period_data in results.get("by_period", []) or []:
+            for row in ExportService._period_csv_rows(
+                period_data.get("period", "TOTAL"), period_data, pct_key
+            ):
+                emitted = True
+                yield row
+
+        # totals fallback for single-period datasets
+        if not emitted and isinstance(results.get("totals"), dict):
+            yield from ExportService._period_csv_rows(
+                "TOTAL", results["totals"], pct_key
+            )
+
+    @staticmethod
+    def _period_csv_rows(
+        period_label: Any, payload: Dict[str, Any], pct_key: str
+    ) -> Iterator[Tuple]:
+        """Yield the CSV_COLUMNS tuples for a single period payload."""
+        for threshold_key, metrics, pct in ExportService._threshold_metrics(
+            payload, pct_key
+        ):
+            yield (
+                period_label,
+                _parse_threshold(threshold_key),
+                metrics.get("count", 0),
+                metrics.get("value", 0),
+                round(pct, 1),
+            )
+
+    @staticmethod
+    def summary_row(
+        period: Any, payload: Dict[str, Any], pct_key: str = "percentage"
+    ) -> Dict[str, Any]:
+        """
+        Build one wide Summary-sheet row (count/value/pct per threshold).
+
+        Producers call this to publish results["by_period_flat"]; the default
+        pct_key matches the analyzer's nested concentration shape. Percentages
+        are rounded with Python's round(), like the CSV rows, so both exports
+        agree on halfway values.
+        """
+        row: Dict[str, Any] = {"period": period, "total": payload.get("total", 0)}
+        for threshold_key, metrics, pct in ExportService._threshold_metrics(
+            payload, pct_key
+        ):
+            row[f"{threshold_key}_count"] = metrics.get("count", 0)
+            row[f"{threshold_key}_value"] = metrics.get("value", 0)
+            row[f"{threshold_key}_pct"] = round(pct, 1)
+        return row
+
     @staticmethod
     def export_concentration_json(results: Dict[str, Any], output_path: Path) -> str:
         """
@@ -244,7 +327,17 @@ class ExportService:
         Returns:
             Path to exported file
         """
-        with open(output_path, "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        if orjson is not None:
+            # Numpy scalars from pandas serialize natively; default=str covers the rest
+            options = (
+                orjson.OPT_INDENT_2
+                | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS
+            )
+            with open(output_path, "wb") as f:
+                f.write(orjson.dumps(results, option=options, default=str))
+        else:
+            with open(output_path, "w") as f:
+                json.dump(results, f, indent=2, default=str)
 
         return str(output_path)
@@ -7,18 +7,64 @@ security, reliability, and cost controls.
 """
 
 import hashlib
+import heapq
 import json
+import logging
+import os
+import re
+import sys
 import time
-from typing import Dict, Any, Optional, List, Tuple
+import weakref
+from time import monotonic as _monotonic
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Iterator,
+    Optional,
+    List,
+    Tuple,
+    TypeVar,
+)
 import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
 from functools import wraps
 
+import httpx
 import openai
-from openai import OpenAI
-from pydantic import BaseModel, ValidationError
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from pydantic import TypeAdapter, ValidationError
 
 from config.settings import settings
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # optional speedup; hashlib.blake2b is used otherwise
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
 
 class LLMUsageError(Exception):
     """Raised when LLM usage limits are exceeded."""
@@ -38,27 +84,108 @@ class NotConfiguredError(Exception):
     pass
 
 
-class LLMCacheEntry(BaseModel):
-    """Cache entry for LLM responses."""
+# Built only from trusted internal values on every request/cache write, so these
+# are plain slotted dataclasses rather than validated Pydantic models
+
+
+@dataclass(slots=True, frozen=True)
+class LLMCacheEntry:
+    """Cache entry for LLM responses (immutable; safe to share)."""
 
     response: Dict[str, Any]
-    timestamp: float
+    timestamp: float  # time.monotonic() at insert; only compared for TTL
     model: str
     provider: str
     usage: Optional[Dict[str, Any]] = None
+    response_bytes: Optional[bytes] = None  # serialized response, on first raw read
 
 
-class LLMRequestMetrics(BaseModel):
+@dataclass(slots=True)
+class LLMRequestMetrics:
     """Metrics for an LLM request."""
 
-    request_id: Optional[str] = None
     provider: str
     model: str
     latency_ms: int
+    request_id: Optional[str] = None
     retry_count: int = 0
     cached: bool = False
     usage: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    fallback_attempts: Optional[List[Dict[str, Any]]] = None
+
+
+class _MalformedJSON(ValueError):
+    """Response text (or a candidate slice of it) is not parseable JSON."""
+
+
+def _json_candidates(text: str) -> Iterator[str]:
+    """
+    Yield substrings of text that may hold the response's JSON object, cheapest
+    first: the outermost first-"{" to last-"}" slice (two C-level scans, right
+    for JSON wrapped in prose), then the first balanced object, for responses
+    with several objects or stray braces.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return
+    outer = text[start : end + 1]
+    yield outer
+
+    span = _extract_json_span(text)
+    if span is not None and span != outer:
+        yield span
+
+
+# Characters that matter when scanning for a JSON object; everything else is
+# skipped by the regex engine instead of a Python-level loop
+_JSON_SCAN_RE = re.compile(r'[{}"\\]')
+
+
+def _extract_json_span(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} object in text, or None.
+
+    A single forward scan tracking brace depth (braces inside JSON strings are
+    ignored), so prose or multiple objects around the JSON can't trigger the
+    backtracking a greedy regex would.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped_at = -1  # index of a character consumed by a backslash escape
+    for match in _JSON_SCAN_RE.finditer(text, start):
+        pos = match.start()
+        if pos == escaped_at:
+            continue
+        char = match.group()
+        if in_string:
+            if char == "\\":
+                escaped_at = pos + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : pos + 1]
+    return None
+
+
+# str.translate table deleting control characters other than newline and tab
+_CONTROL_CHARS = dict.fromkeys(code for code in range(32) if chr(code) not in "\n\t")
+
+
+def _is_json_error(error: ValidationError) -> bool:
+    """Whether a validate_json failure is malformed JSON, not a schema miss."""
+    return any(detail["type"] == "json_invalid" for detail in error.errors())
 
 
 def retry_with_backoff(max_retries: int = 2, base_delay: float = 1.0):
@@ -95,7 +222,7 @@ class LLMClient:
 
     Features:
     - Multiple providers via base_url overrides
-    - Comprehensive caching with TTL
+    - Comprehensive caching with TTL, plus an optional on-disk response cache
     - Cost controls and usage tracking
     - Retry logic with exponential backoff
     - Request validation and security hardening
@@ -124,87 +251,208 @@ class LLMClient:
         "gemini": {"gemini-flash": "gemini-1.5-flash", "gemini-pro": "gemini-1.5-pro"},
     }
 
+    # (provider, friendly name) -> provider model name, for single-lookup mapping
+    _FLAT_MODEL_MAP = {
+        (sys.intern(provider), friendly): sys.intern(actual)
+        for provider, mapping in MODEL_MAPPINGS.items()
+        for friendly, actual in mapping.items()
+    }
+
+    # Shared HTTP connection pool for all provider clients
+    HTTP_MAX_CONNECTIONS = 1000
+    HTTP_MAX_KEEPALIVE = 200
+    HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds
+
+    # Expired cache entries are swept every this many inserts
+    CACHE_SWEEP_INTERVAL = 64
+
     def __init__(self):
-        self._clients: Dict[str, OpenAI] = {}
-        self._cache: Dict[str, LLMCacheEntry] = {}
+        # Configured providers -> AsyncOpenAI kwargs; the clients themselves are
+        # built per event loop (see _client), as (http client, provider clients)
+        self._clients: Dict[str, Dict[str, Any]] = {}
+        self._loop_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # LRU order: least recently used first
+        self._cache: "OrderedDict[str, LLMCacheEntry]" = OrderedDict()
+        self._cache_expiry: List[Tuple[float, str]] = []  # heap of (expires_at, key)
+        self._inserts_since_sweep = 0
+        self._inflight: Dict[str, asyncio.Future] = {}  # request key -> pending result
         self._usage_tracker: Dict[str, int] = {}  # dataset_id -> call count
+        self._usage_resets = 0  # bumped by reset_usage, so stale refunds are skipped
+        self._adapters: Dict[Any, TypeAdapter] = {}  # response_model -> adapter
+
+        # Settings read on every request, captured once (settings are fixed for
+        # the process; llm_response_cache_dir stays live for the demo scripts)
+        self._timeout = getattr(settings, "llm_timeout", 30)
+        self._default_temperature = settings.llm_temperature
+        self._default_max_tokens = settings.llm_max_tokens
+        self._default_provider = settings.llm_provider or "openai"
+        self._default_model = settings.llm_model or "gpt-4.1-mini"
+        self._cache_ttl = getattr(settings, "llm_cache_ttl", 86400)  # 24h default
+        self._cache_max_entries = settings.llm_cache_max_entries
+        self._max_calls = getattr(settings, "llm_max_calls_per_dataset", 10)
+        self._max_concurrency = settings.llm_max_concurrency
 
         # Initialize provider clients
         self._setup_clients()
 
     def _setup_clients(self):
-        """Initialize provider-specific OpenAI clients."""
-
-        # OpenAI (native). Create even if api_key not set and rely on env var fallback.
-        try:
-            if hasattr(settings, "openai_api_key") and settings.openai_api_key:
-                self._clients["openai"] = OpenAI(
-                    api_key=settings.openai_api_key,
-                    timeout=(
-                        settings.llm_timeout if hasattr(settings, "llm_timeout") else 30
-                    ),
-                )
-            else:
-                # Will pick up OPENAI_API_KEY from environment if present
-                self._clients["openai"] = OpenAI(
-                    timeout=(
-                        settings.llm_timeout if hasattr(settings, "llm_timeout") else 30
-                    )
-                )
-        except Exception:
-            # If client cannot be created, leave unconfigured; executors will fallback
-            pass
+        """Record which providers are configured, with their client settings."""
+        timeout = self._timeout
+
+        # OpenAI (native). Without an explicit key the SDK falls back to the
+        # OPENAI_API_KEY env var; with neither, leave it unconfigured
+        if hasattr(settings, "openai_api_key") and settings.openai_api_key:
+            self._clients["openai"] = {
+                "api_key": settings.openai_api_key,
+                "timeout": timeout,
+            }
+        elif os.environ.get("OPENAI_API_KEY"):
+            self._clients["openai"] = {"timeout": timeout}
 
         # Anthropic via OpenAI SDK
         if hasattr(settings, "anthropic_api_key") and settings.anthropic_api_key:
-            self._clients["anthropic"] = OpenAI(
-                api_key=settings.anthropic_api_key,
-                base_url=self.ALLOWED_BASE_URLS["anthropic"],
-                timeout=(
-                    settings.llm_timeout if hasattr(settings, "llm_timeout") else 30
-                ),
-            )
+            self._clients["anthropic"] = {
+                "api_key": settings.anthropic_api_key,
+                "base_url": self.ALLOWED_BASE_URLS["anthropic"],
+                "timeout": timeout,
+            }
 
         # Google Gemini via OpenAI SDK (if supported)
         if hasattr(settings, "google_api_key") and settings.google_api_key:
-            self._clients["gemini"] = OpenAI(
-                api_key=settings.google_api_key,
-                base_url=self.ALLOWED_BASE_URLS["gemini"],
-                timeout=(
-                    settings.llm_timeout if hasattr(settings, "llm_timeout") else 30
-                ),
+            self._clients["gemini"] = {
+                "api_key": settings.google_api_key,
+                "base_url": self.ALLOWED_BASE_URLS["gemini"],
+                "timeout": timeout,
+            }
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client shared by all providers on one event loop."""
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=self.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=self.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=self._timeout,
+        )
+
+    def _client(self, provider: str) -> AsyncOpenAI:
+        """
+        Provider client for the running event loop.
+
+        Pooled connections are bound to the loop that opened them, so each loop
+        gets its own clients and connection pool. Open connections keep their
+        loop alive, so one-shot loops (e.g. asyncio.run in the sync wrappers)
+        must close them with loop_scope() / run_in_loop().
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._loop_clients.get(loop)
+        if entry is None:
+            http_client = self._http_client()
+            entry = self._loop_clients[loop] = (
+                http_client,
+                {
+                    name: AsyncOpenAI(**kwargs, http_client=http_client)
+                    for name, kwargs in self._clients.items()
+                },
             )
+        return entry[1][provider]
 
-    def _get_provider_model(self, model: Optional[str] = None) -> Tuple[str, str]:
-        """Get provider and actual model name."""
-        model = model or settings.llm_model or "gpt-4.1-mini"
-        provider = settings.llm_provider or "openai"
+    async def aclose(self) -> None:
+        """Close the running event loop's provider clients and connection pool."""
+        entry = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].aclose()
 
-        # Map friendly names to provider-specific names
-        if provider in self.MODEL_MAPPINGS:
-            model = self.MODEL_MAPPINGS[provider].get(model, model)
+    @asynccontextmanager
+    async def loop_scope(self) -> AsyncIterator[None]:
+        """Close the running loop's clients on exit, for loops about to end."""
+        try:
+            yield
+        finally:
+            await self.aclose()
+
+    async def run_in_loop(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await within loop_scope(), for sync code driving a one-shot loop:
+        asyncio.run(llm_client.run_in_loop(coro)).
+        """
+        async with self.loop_scope():
+            return await awaitable
+
+    def _get_provider_model(
+        self, model: Optional[str] = None, provider: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Get provider (explicit override, else settings) and actual model name."""
+        model = model or self._default_model
+        provider = provider or self._default_provider
 
-        return provider, model
+        # Map friendly names to provider-specific names
+        return provider, self._FLAT_MODEL_MAP.get((provider, model), model)
 
     def _generate_context_hash(self, context: Dict[str, Any]) -> str:
-        """Generate a hash of the context for caching."""
+        """
+        Generate a 16-hex-char hash of the context for caching.
+
+        This is a cache key, not a security boundary, so a fast non-cryptographic
+        hash (xxh3, else blake2b) is used instead of SHA-256.
+        """
         # Sort keys to ensure consistent hashing
-        context_str = json.dumps(context, sort_keys=True, default=str)
-        return hashlib.sha256(context_str.encode()).hexdigest()[:16]
+        if orjson is not None:
+            payload = orjson.dumps(
+                context,
+                default=str,
+                option=orjson.OPT_SORT_KEYS
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        else:
+            payload = json.dumps(context, sort_keys=True, default=str).encode()
 
-    def _check_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Check if response is cached and still valid."""
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(payload)[:16]
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+    def _cache_key(
+        self,
+        function_name: str,
+        actual_model: str,
+        context: Dict[str, Any],
+        context_hash: Optional[str] = None,
+    ) -> str:
+        """In-memory cache key for a function call over a context."""
+        context_hash = context_hash or self._generate_context_hash(context)
+        return f"{function_name}:{actual_model}:{context_hash}"
+
+    def _cache_entry(self, cache_key: str) -> Optional[LLMCacheEntry]:
+        """Return the cache entry if present and still valid (marking it used)."""
         if cache_key not in self._cache:
             return None
 
         entry = self._cache[cache_key]
-        cache_ttl = getattr(settings, "llm_cache_ttl", 86400)  # 24 hours default
-
-        if time.time() - entry.timestamp > cache_ttl:
+        if _monotonic() - entry.timestamp > self._cache_ttl:
             del self._cache[cache_key]
             return None
 
-        return entry.response
+        self._cache.move_to_end(cache_key)
+        return entry
+
+    def _check_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Check if response is cached and still valid."""
+        entry = self._cache_entry(cache_key)
+        return entry.response if entry is not None else None
+
+    def _check_cache_raw(self, cache_key: str) -> Optional[bytes]:
+        """Cached response as JSON bytes, serialized once per entry."""
+        entry = self._cache_entry(cache_key)
+        if entry is None:
+            return None
+        if entry.response_bytes is None:
+            # Entries are frozen: swap in a copy carrying the bytes (the key
+            # keeps its LRU position and the timestamp its expiry)
+            entry = replace(entry, response_bytes=_json_dumps(entry.response))
+            self._cache[cache_key] = entry
+        return entry.response_bytes
 
     def _cache_response(
         self,
@@ -214,28 +462,187 @@ class LLMClient:
         model: str,
         usage: Optional[Dict[str, Any]] = None,
     ):
-        """Cache an LLM response."""
-        self._cache[cache_key] = LLMCacheEntry(
+        """Cache an LLM response, evicting the least recently used past capacity."""
+        entry = LLMCacheEntry(
             response=response,
-            timestamp=time.time(),
+            timestamp=_monotonic(),
             model=model,
             provider=provider,
             usage=usage,
         )
+        self._cache[cache_key] = entry
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
 
-    def _check_usage_limits(self, dataset_id: str):
-        """Check if dataset has exceeded usage limits."""
-        max_calls = getattr(settings, "llm_max_calls_per_dataset", 10)
-        current_calls = self._usage_tracker.get(dataset_id, 0)
+        heapq.heappush(
+            self._cache_expiry, (entry.timestamp + self._cache_ttl, cache_key)
+        )
+        self._inserts_since_sweep += 1
+        if self._inserts_since_sweep >= self.CACHE_SWEEP_INTERVAL:
+            self._sweep_cache()
+
+    def _sweep_cache(self):
+        """Drop expired entries in expiry order, without scanning the whole cache."""
+        self._inserts_since_sweep = 0
+        cache_ttl = self._cache_ttl
+        now = _monotonic()
+        while self._cache_expiry and self._cache_expiry[0][0] <= now:
+            _, cache_key = heapq.heappop(self._cache_expiry)
+            entry = self._cache.get(cache_key)
+            # Skip keys already evicted or re-cached since this record was pushed
+            if entry is not None and now - entry.timestamp > cache_ttl:
+                del self._cache[cache_key]
+
+        # Records for evicted/overwritten keys linger until they expire; rebuild
+        # the heap from live entries if they start to dominate it
+        live = max(len(self._cache), self.CACHE_SWEEP_INTERVAL)
+        if len(self._cache_expiry) > 2 * live:
+            self._cache_expiry = [
+                (entry.timestamp + cache_ttl, key) for key, entry in self._cache.items()
+            ]
+            heapq.heapify(self._cache_expiry)
+
+    def _request_key(
+        self,
+        function_name: str,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        sanitize: bool = True,
+    ) -> str:
+        """SHA256 identifying an exact request (coalescing and disk cache key)."""
+        payload = {
+            "function": function_name,
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        # Only unsanitized requests carry the flag, so existing keys stay valid
+        if not sanitize:
+            payload["sanitize"] = False
+        key_str = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+    def _disk_cache_path(self, request_key: str) -> Optional[Path]:
+        """Path of the on-disk response for this exact request, if enabled."""
+        cache_dir = settings.llm_response_cache_dir
+        if not cache_dir:
+            return None
+        return Path(cache_dir) / f"{request_key}.json"
 
-        if current_calls >= max_calls:
-            raise LLMUsageError(
-                f"Dataset {dataset_id} has exceeded maximum LLM calls ({max_calls})"
+    def _read_disk_cache(
+        self, path: Optional[Path], response_model: Optional[type] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a persisted response, validated against response_model.
+
+        Unreadable entries, and entries that no longer match the model (e.g.
+        written under an older schema), count as misses.
+        """
+        if path is None or not path.exists():
+            return None
+        try:
+            response = _json_loads(path.read_bytes())["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+        if response_model is None:
+            return response
+        adapter = self._adapter(response_model)
+        try:
+            return adapter.dump_python(adapter.validate_python(response))
+        except ValidationError:
+            logger.warning("Ignoring stale LLM disk cache entry %s", path.name)
+            return None
+
+    def _write_disk_cache(
+        self, path: Optional[Path], response: Dict[str, Any], provider: str, model: str
+    ):
+        """
+        Persist a validated response for later identical requests.
+
+        Best effort: a failed write is logged and never fails the request.
+        """
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"response": response, "provider": provider, "model": model},
+                    default=str,
+                )
+            )
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning("Could not write LLM disk cache entry %s: %s", path, e)
+
+    def _adapter(self, response_model: Any) -> TypeAdapter:
+        """TypeAdapter for response_model, built once per model."""
+        adapter = self._adapters.get(response_model)
+        if adapter is None:
+            adapter = self._adapters[response_model] = TypeAdapter(response_model)
+        return adapter
+
+    def _parse_response(
+        self, response_text: str, response_model: Optional[type] = None
+    ) -> Dict[str, Any]:
+        """
+        Parse a raw LLM response into a dict, validating it against response_model.
+
+        With a model, the text is parsed and validated in a single
+        validate_json pass of a TypeAdapter built once per response_model, so
+        any type pydantic can validate works, not only BaseModel classes. If the
+        text is not pure JSON, the object embedded in it is tried instead (see
+        _json_candidates).
+        """
+        adapter = self._adapter(response_model) if response_model is not None else None
+
+        def parse(text: str) -> Dict[str, Any]:
+            if adapter is None:
+                try:
+                    return _json_loads(text)
+                except json.JSONDecodeError as e:
+                    raise _MalformedJSON(str(e))
+            try:
+                return adapter.dump_python(adapter.validate_json(text))
+            except ValidationError as e:
+                if _is_json_error(e):
+                    raise _MalformedJSON(str(e))
+                raise LLMValidationError(f"Response validation failed: {str(e)}")
+
+        try:
+            # Surrounding whitespace is valid JSON; no strip() copy needed
+            return parse(response_text)
+        except _MalformedJSON as e:
+            first_error = e
+
+        found = False
+        for candidate in _json_candidates(response_text):
+            found = True
+            try:
+                return parse(candidate)
+            except _MalformedJSON:
+                continue
+
+        if not found:
+            raise LLMValidationError(
+                f"No JSON found in response: {response_text[:200]}"
             )
+        raise LLMValidationError(f"Invalid JSON response: {str(first_error)}")
 
-    def _track_usage(self, dataset_id: str):
-        """Track usage for a dataset."""
-        self._usage_tracker[dataset_id] = self._usage_tracker.get(dataset_id, 0) + 1
+    def _incr_or_raise(self, dataset_id: str):
+        """Claim one provider call for a dataset, or raise if over its limit."""
+        current_calls = self._usage_tracker.get(dataset_id, 0)
+        if current_calls >= self._max_calls:
+            raise LLMUsageError(
+                f"Dataset {dataset_id} has exceeded maximum LLM calls "
+                f"({self._max_calls})"
+            )
+        self._usage_tracker[dataset_id] = current_calls + 1
 
     def _sanitize_user_input(self, user_input: str) -> str:
         """Sanitize user input to prevent injection attacks."""
@@ -247,12 +654,8 @@ class LLMClient:
         if len(user_input) > max_length:
             user_input = user_input[:max_length] + "..."
 
-        # Basic sanitization (remove control characters)
-        sanitized = "".join(
-            char for char in user_input if ord(char) >= 32 or char in "\n\t"
-        )
-
-        return sanitized
+        # Basic sanitization (remove control characters) in one C-level pass
+        return user_input.translate(_CONTROL_CHARS)
 
     @retry_with_backoff()
     async def chat(
@@ -262,6 +665,8 @@ class LLMClient:
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         request_id: Optional[str] = None,
+        provider: Optional[str] = None,
+        sanitize: bool = True,
     ) -> Tuple[str, LLMRequestMetrics]:
         """
         Send a chat completion request.
@@ -272,35 +677,43 @@ class LLMClient:
             temperature: Temperature for sampling
             max_tokens: Maximum tokens to generate
             request_id: Request ID for tracking
+            provider: Provider override (defaults to settings.llm_provider)
+            sanitize: Clean user messages first; pass False only for trusted,
+                already-bounded prompts
 
         Returns:
             Tuple of (response_text, metrics)
         """
-        start_time = time.time()
-        provider, actual_model = self._get_provider_model(model)
+        start_time = time.perf_counter()
+        provider, actual_model = self._get_provider_model(model, provider)
 
         if provider not in self._clients:
             raise ValueError(f"Provider {provider} not configured")
 
-        # Sanitize user messages
-        sanitized_messages = []
-        for msg in messages:
-            sanitized_msg = msg.copy()
-            if msg.get("role") == "user":
-                sanitized_msg["content"] = self._sanitize_user_input(msg["content"])
-            sanitized_messages.append(sanitized_msg)
+        # Sanitize user messages; other messages are passed through unchanged
+        sanitized_messages = (
+            [
+                (
+                    {**msg, "content": self._sanitize_user_input(msg["content"])}
+                    if msg.get("role") == "user"
+                    else msg
+                )
+                for msg in messages
+            ]
+            if sanitize
+            else messages
+        )
 
         try:
-            client = self._clients[provider]
-            response = await asyncio.to_thread(
-                client.chat.completions.create,
+            client = self._client(provider)
+            response = await client.chat.completions.create(
                 model=actual_model,
                 messages=sanitized_messages,
-                temperature=temperature or settings.llm_temperature,
-                max_tokens=max_tokens or settings.llm_max_tokens,
+                temperature=temperature or self._default_temperature,
+                max_tokens=max_tokens or self._default_max_tokens,
             )
 
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             content = response.choices[0].message.content
             usage = response.usage.model_dump() if response.usage else None
 
@@ -315,7 +728,7 @@ class LLMClient:
             return content, metrics
 
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             metrics = LLMRequestMetrics(
                 request_id=request_id,
                 provider=provider,
@@ -336,12 +749,18 @@ class LLMClient:
         dataset_id: Optional[str] = None,
         function_name: str = "unknown",
         context: Optional[Dict[str, Any]] = None,
+        provider: Optional[str] = None,
+        context_hash: Optional[str] = None,
+        sanitize: bool = True,
     ) -> Tuple[Dict[str, Any], LLMRequestMetrics]:
         """
         Send a JSON-formatted chat completion request with caching and validation.
 
+        Identical requests made while one is already in flight share its result
+        (or exception) instead of issuing another provider call.
+
         Args:
-            messages: List of message dicts
+            messages: List of message dicts (never modified; safe to reuse)
             response_model: Pydantic model for validation
             model: Model name
             temperature: Temperature for sampling
@@ -350,20 +769,83 @@ class LLMClient:
             dataset_id: Dataset ID for usage tracking
             function_name: Function name for caching
             context: Context dict for cache key generation
+            provider: Provider override (defaults to settings.llm_provider)
+            context_hash: Precomputed _generate_context_hash(context), if known
+            sanitize: Forwarded to chat; False skips user-input sanitization
 
         Returns:
             Tuple of (parsed_json, metrics)
         """
-        # Check usage limits if dataset_id provided
-        if dataset_id:
-            self._check_usage_limits(dataset_id)
+        provider, actual_model = self._get_provider_model(model, provider)
+        if temperature is None:
+            temperature = self._default_temperature
+        request_key = self._request_key(
+            function_name, provider, actual_model, messages, temperature, sanitize
+        )
+
+        # Identical request already in flight: share its result instead of
+        # issuing a second provider call
+        pending = self._inflight.get(request_key)
+        if pending is not None:
+            response_json, metrics = await asyncio.shield(pending)
+            # Own metrics per caller: chat_json_with_fallback mutates them
+            return response_json, replace(metrics, request_id=request_id)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[request_key] = future
+        try:
+            result = await self._chat_json(
+                messages=messages,
+                request_key=request_key,
+                response_model=response_model,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                request_id=request_id,
+                dataset_id=dataset_id,
+                function_name=function_name,
+                context=context,
+                provider=provider,
+                context_hash=context_hash,
+                sanitize=sanitize,
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[request_key]
 
+    async def _chat_json(
+        self,
+        messages: List[Dict[str, str]],
+        request_key: str,
+        response_model: Optional[type] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        request_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        function_name: str = "unknown",
+        context: Optional[Dict[str, Any]] = None,
+        provider: Optional[str] = None,
+        context_hash: Optional[str] = None,
+        sanitize: bool = True,
+    ) -> Tuple[Dict[str, Any], LLMRequestMetrics]:
+        """Uncoalesced body of chat_json (caches, provider call, validation)."""
         # Generate cache key
         cache_key = None
         if context:
-            context_hash = self._generate_context_hash(context)
-            provider, actual_model = self._get_provider_model(model)
-            cache_key = f"{function_name}:{actual_model}:{context_hash}"
+            provider, actual_model = self._get_provider_model(model, provider)
+            cache_key = self._cache_key(
+                function_name, actual_model, context, context_hash
+            )
 
             # Check cache first
             cached_response = self._check_cache(cache_key)
@@ -377,8 +859,21 @@ class LLMClient:
                 )
                 return cached_response, metrics
 
-        start_time = time.time()
-        provider, actual_model = self._get_provider_model(model)
+        start_time = time.perf_counter()
+        provider, actual_model = self._get_provider_model(model, provider)
+
+        # Persistent cache keyed on the exact request (opt-in, used by demos)
+        disk_cache_path = self._disk_cache_path(request_key)
+        disk_response = self._read_disk_cache(disk_cache_path, response_model)
+        if disk_response is not None:
+            metrics = LLMRequestMetrics(
+                request_id=request_id,
+                provider=provider,
+                model=actual_model,
+                latency_ms=0,
+                cached=True,
+            )
+            return disk_response, metrics
 
         # Check if provider is configured
         if provider not in self._clients:
@@ -387,6 +882,13 @@ class LLMClient:
         # JSON format instructions are now included in LLM_FUNCTION_PROMPTS
         # No need for generic client-side additions (DRY principle)
 
+        # Only provider calls count against the dataset limit; the call is
+        # claimed before awaiting so concurrent requests cannot overshoot it
+        if dataset_id:
+            self._incr_or_raise(dataset_id)
+        unclaim = dataset_id  # cleared on success
+        claimed_after_reset = self._usage_resets
+
         try:
             # Get raw text response
             response_text, base_metrics = await self.chat(
@@ -395,48 +897,27 @@ class LLMClient:
                 temperature=temperature,
                 max_tokens=max_tokens,
                 request_id=request_id,
+                provider=provider,
+                sanitize=sanitize,
             )
 
-            # Parse JSON
-            try:
-                response_json = json.loads(response_text.strip())
-            except json.JSONDecodeError as e:
-                # Try to extract JSON from response
-                import re
-
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    try:
-                        response_json = json.loads(json_match.group())
-                    except json.JSONDecodeError:
-                        raise LLMValidationError(f"Invalid JSON response: {str(e)}")
-                else:
-                    raise LLMValidationError(
-                        f"No JSON found in response: {response_text[:200]}"
-                    )
-
-            # Validate with Pydantic model if provided
-            if response_model:
-                try:
-                    validated = response_model(**response_json)
-                    response_json = validated.model_dump()
-                except ValidationError as e:
-                    raise LLMValidationError(f"Response validation failed: {str(e)}")
+            # Parse (and validate, in one pass when a model is given)
+            response_json = self._parse_response(response_text, response_model)
 
             # Cache the response
             if cache_key:
                 self._cache_response(
                     cache_key, response_json, provider, actual_model, base_metrics.usage
                 )
+            self._write_disk_cache(
+                disk_cache_path, response_json, provider, actual_model
+            )
 
-            # Track usage
-            if dataset_id:
-                self._track_usage(dataset_id)
-
+            unclaim = None
             return response_json, base_metrics
 
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = int((time.perf_counter() - start_time) * 1000)
             metrics = LLMRequestMetrics(
                 request_id=request_id,
                 provider=provider,
@@ -445,6 +926,106 @@ class LLMClient:
                 error=str(e),
             )
             raise e
+        finally:
+            # Failed or cancelled calls are not charged (fallbacks retry them),
+            # unless usage was reset meanwhile: the claim is gone, and a count
+            # re-created since then belongs to other calls
+            if (
+                unclaim
+                and self._usage_resets == claimed_after_reset
+                and self._usage_tracker.get(unclaim)
+            ):
+                self._usage_tracker[unclaim] -= 1
+
+    async def chat_json_raw(
+        self,
+        messages: List[Dict[str, str]],
+        response_model: Optional[type] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        request_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        function_name: str = "unknown",
+        context: Optional[Dict[str, Any]] = None,
+        provider: Optional[str] = None,
+        context_hash: Optional[str] = None,
+        sanitize: bool = True,
+    ) -> Tuple[bytes, LLMRequestMetrics]:
+        """
+        Like chat_json, but return the response as serialized JSON bytes.
+
+        For callers that send the result straight back out (e.g. API responses):
+        cache hits reuse the entry's stored serialization, skipping a
+        decode/encode round-trip.
+
+        Returns:
+            Tuple of (response_json_bytes, metrics)
+        """
+        cache_key = None
+        if context:
+            provider, actual_model = self._get_provider_model(model, provider)
+            context_hash = context_hash or self._generate_context_hash(context)
+            cache_key = self._cache_key(
+                function_name, actual_model, context, context_hash
+            )
+            cached_bytes = self._check_cache_raw(cache_key)
+            if cached_bytes is not None:
+                metrics = LLMRequestMetrics(
+                    request_id=request_id,
+                    provider=provider,
+                    model=actual_model,
+                    latency_ms=0,
+                    cached=True,
+                )
+                return cached_bytes, metrics
+
+        response_json, metrics = await self.chat_json(
+            messages=messages,
+            response_model=response_model,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            request_id=request_id,
+            dataset_id=dataset_id,
+            function_name=function_name,
+            context=context,
+            provider=provider,
+            context_hash=context_hash,
+            sanitize=sanitize,
+        )
+        # Serialize through the cache entry so later raw hits reuse the bytes
+        raw = self._check_cache_raw(cache_key) if cache_key else None
+        return (raw if raw is not None else _json_dumps(response_json)), metrics
+
+    async def chat_json_many(
+        self,
+        reqs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Run several chat_json requests concurrently, at most max_concurrency at once.
+
+        Each request is a dict of chat_json keyword arguments. Requests still
+        share the response caches and in-flight coalescing.
+
+        Args:
+            reqs: chat_json keyword arguments, one dict per request
+            max_concurrency: In-flight cap (defaults to settings.llm_max_concurrency)
+
+        Returns:
+            Per request, in order: a (parsed_json, metrics) tuple, or the
+            exception it raised
+        """
+        slots = asyncio.Semaphore(max_concurrency or self._max_concurrency)
+
+        async def one(req: Dict[str, Any]) -> Tuple[Dict[str, Any], LLMRequestMetrics]:
+            async with slots:
+                return await self.chat_json(**req)
+
+        return await asyncio.gather(
+            *(one(req) for req in reqs), return_exceptions=True
+        )
 
     def get_usage_stats(self, dataset_id: Optional[str] = None) -> Dict[str, Any]:
         """Get usage statistics."""
@@ -452,7 +1033,7 @@ class LLMClient:
             return {
                 "dataset_id": dataset_id,
                 "calls_made": self._usage_tracker.get(dataset_id, 0),
-                "max_calls": getattr(settings, "llm_max_calls_per_dataset", 10),
+                "max_calls": self._max_calls,
             }
 
         return {
@@ -465,9 +1046,12 @@ class LLMClient:
     def clear_cache(self):
         """Clear the response cache."""
         self._cache.clear()
+        self._cache_expiry.clear()
+        self._inserts_since_sweep = 0
 
     def reset_usage(self, dataset_id: Optional[str] = None):
         """Reset usage tracking."""
+        self._usage_resets += 1
         if dataset_id:
             self._usage_tracker.pop(dataset_id, None)
         else:
@@ -502,7 +1086,6 @@ class LLMClient:
         if not fallback_chain:
             fallback_chain = ["openai", "gemini", "anthropic"]
 
-        original_provider = settings.llm_provider
         attempts = []
         last_error = None
 
@@ -518,9 +1101,6 @@ class LLMClient:
                 continue
 
             try:
-                # Temporarily switch provider
-                settings.llm_provider = provider
-
                 response_json, metrics = await self.chat_json(
                     messages=messages,
                     response_model=response_model,
@@ -531,6 +1111,7 @@ class LLMClient:
                     dataset_id=dataset_id,
                     function_name=function_name,
                     context=context,
+                    provider=provider,
                 )
 
                 # Success - add attempt info and return
@@ -544,13 +1125,7 @@ class LLMClient:
 
                 # Add attempt info to metrics
                 metrics.retry_count = len(attempts) - 1
-                if hasattr(metrics, "fallback_attempts"):
-                    metrics.fallback_attempts = attempts
-                else:
-                    # Add as a dict field since metrics is a Pydantic model
-                    metrics_dict = metrics.model_dump()
-                    metrics_dict["fallback_attempts"] = attempts
-                    metrics = LLMRequestMetrics(**metrics_dict)
+                metrics.fallback_attempts = attempts
 
                 return response_json, metrics
 
@@ -575,30 +1150,17 @@ class LLMClient:
                 last_error = e
                 break
 
-            finally:
-                # Restore original provider
-                settings.llm_provider = original_provider
-
-        # All providers failed
-        settings.llm_provider = original_provider
-
-        # Create error metrics with attempt details
+        # All providers failed - create error metrics with attempt details
         metrics = LLMRequestMetrics(
             request_id=request_id,
-            provider=original_provider,
-            model=model or settings.llm_model,
+            provider=self._default_provider,
+            model=model or self._default_model,
             latency_ms=0,
             retry_count=len(attempts),
             error=f"All providers failed: {str(last_error)}",
+            fallback_attempts=attempts,
         )
 
-        if hasattr(metrics, "fallback_attempts"):
-            metrics.fallback_attempts = attempts
-        else:
-            metrics_dict = metrics.model_dump()
-            metrics_dict["fallback_attempts"] = attempts
-            metrics = LLMRequestMetrics(**metrics_dict)
-
         # Re-raise the last error
         if last_error:
             raise last_error
@@ -4,6 +4,7 @@ High-level service that orchestrates data normalization with storage persistence
 """
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -44,34 +45,38 @@ class NormalizationService:
         # Update schema with dataset_id
         result.schema["dataset_id"] = dataset_id
 
-        # Save normalized data as Parquet
+        # Save normalized data as Parquet and schema as JSON concurrently: distinct
+        # files, and pyarrow releases the GIL while writing Parquet
         normalized_path = dataset_path / "normalized.parquet"
-        checksum = self.storage.write_parquet(result.data, normalized_path)
-
-        # Save schema as JSON
-        self.registry.save_schema(dataset_id, result.schema)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            parquet_write = pool.submit(
+                self.storage.write_parquet, result.data, normalized_path
+            )
+            schema_write = pool.submit(
+                self.registry.save_schema, dataset_id, result.schema
+            )
+            checksum = parquet_write.result()
+            schema_write.result()
 
         # Create comprehensive lineage step
+        stats = result.statistics
+        transformations = result.schema["transformations_summary"]
         lineage_step = self.registry.append_lineage_step(
             dataset_id=dataset_id,
             operation="normalize",
             inputs=[f"raw/{original_filename}"],
             outputs=["normalized.parquet", "schema.json"],
             params={
-                "original_columns": len(df.columns),
-                "original_rows": len(df),
-                "normalized_columns": len(result.data.columns),
-                "normalized_rows": len(result.data),
+                "original_columns": df.shape[1],
+                "original_rows": df.shape[0],
+                "normalized_columns": result.data.shape[1],
+                "normalized_rows": result.data.shape[0],
             },
             metrics={
-                "transformations_applied": result.statistics["total_transformations"],
-                "warnings_generated": result.statistics["warnings_count"],
-                "columns_modified": result.schema["transformations_summary"][
-                    "columns_modified"
-                ],
-                "transformation_types": result.schema["transformations_summary"][
-                    "transformation_types"
-                ],
+                "transformations_applied": stats["total_transformations"],
+                "warnings_generated": stats["warnings_count"],
+                "columns_modified": transformations["columns_modified"],
+                "transformation_types": transformations["transformation_types"],
                 "parquet_checksum": checksum,
             },
         )
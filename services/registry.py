@@ -4,13 +4,66 @@ Manages dataset lifecycle, schema, and lineage tracking.
 """
 
 import json
+import os
 import uuid
 from datetime import datetime, UTC
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 from config.settings import settings
 from services.exceptions import DatasetNotFoundError
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
+
+# Numpy scalars serialize natively; datetimes pass through to default=str so
+# they are written exactly as the stdlib fallback writes them
+_ORJSON_LINE_OPTIONS = (
+    (
+        orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+    if orjson is not None
+    else 0
+)
+_ORJSON_OPTIONS = _ORJSON_LINE_OPTIONS | (orjson.OPT_INDENT_2 if orjson else 0)
+
+# Lineage steps are appended here, one JSON object per line, next to the
+# lineage.json header; get_lineage() merges them back into "steps"
+LINEAGE_LOG = "lineage_steps.jsonl"
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (the registry's timestamp format)."""
+    return datetime.now(UTC).isoformat()
+
+
+def _iter_lines_reversed(path: Path, block_size: int = 4096) -> Iterator[bytes]:
+    """Non-empty lines of a file, last first, read backwards from the end."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            # The first piece may continue in the preceding block
+            partial, *lines = (f.read(size) + partial).split(b"\n")
+            yield from filter(None, reversed(lines))
+        if partial:
+            yield partial
+
+
+def _has_entries(path: str) -> bool:
+    """Whether a directory has at least one entry (False if it is gone)."""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
+
 
 class DatasetRegistry:
     """Manages dataset lifecycle and metadata."""
@@ -41,7 +94,7 @@ class DatasetRegistry:
         # Initialize lineage
         lineage = {
             "dataset_id": dataset_id,
-            "created_at": datetime.now(UTC).isoformat(),
+            "created_at": _now_iso(),
             "original_filename": original_filename,
             "steps": [],
         }
@@ -62,18 +115,28 @@ class DatasetRegistry:
         """
         dataset_path = self.storage_path / dataset_id
 
-        if not dataset_path.exists():
+        # One directory listing answers every existence check: DirEntry types
+        # come from the listing itself (d_type), so no per-file stat; the
+        # subfolders are only opened when present. Not cached: the raw upload,
+        # normalized.parquet and analyses/ are written outside the registry
+        # (StorageService, the exporters), so a cache invalidated on registry
+        # writes would report stale flags between upload, normalize and analyze
+        try:
+            with os.scandir(dataset_path) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
             raise DatasetNotFoundError(dataset_id)
 
-        # Check what files exist
-        has_raw = (dataset_path / "raw").exists() and any(
-            (dataset_path / "raw").iterdir()
-        )
-        has_normalized = (dataset_path / "normalized.parquet").exists()
-        has_schema = (dataset_path / "schema.json").exists()
-        has_analyses = (dataset_path / "analyses").exists() and any(
-            (dataset_path / "analyses").iterdir()
-        )
+        def is_dir(name: str) -> bool:
+            return name in entries and entries[name].is_dir()
+
+        def is_file(name: str) -> bool:
+            return name in entries and entries[name].is_file()
+
+        has_raw = is_dir("raw") and _has_entries(entries["raw"].path)
+        has_normalized = is_file("normalized.parquet")
+        has_schema = is_file("schema.json")
+        has_analyses = is_dir("analyses") and _has_entries(entries["analyses"].path)
 
         return {
             "dataset_id": dataset_id,
@@ -94,6 +157,7 @@ class DatasetRegistry:
         params: Optional[Dict[str, Any]] = None,
         metrics: Optional[Dict[str, Any]] = None,
         llm_info: Optional[Dict[str, Any]] = None,
+        now: Optional[str] = None,
     ) -> str:
         """
         Append a step to the dataset's lineage.
@@ -106,23 +170,37 @@ class DatasetRegistry:
             params: Operation parameters
             metrics: Computed metrics
             llm_info: LLM usage information
+            now: Step timestamp (ISO 8601), to share one clock reading across
+                related writes; defaults to the current time
 
         Returns:
             Step ID
         """
-        lineage_path = self.storage_path / dataset_id / "lineage.json"
+        dataset_path = self.storage_path / dataset_id
+        lineage_path = dataset_path / "lineage.json"
 
         if not lineage_path.exists():
             raise DatasetNotFoundError(
                 dataset_id, f"Lineage file not found for dataset {dataset_id}"
             )
 
-        lineage = self._load_json(lineage_path)
-
-        step_id = f"st_{len(lineage['steps']) + 1:04d}"
+        # Steps are appended to the log and numbered from the last logged step,
+        # read from the log's tail, so an append costs O(step) whatever the
+        # history. Only the first logged step counts the header's steps (older
+        # datasets keep theirs there). A torn line left by a crash mid-append
+        # is skipped.
+        log_path = dataset_path / LINEAGE_LOG
+        lines = _iter_lines_reversed(log_path) if log_path.exists() else ()
+        last_step = next(filter(None, map(self._loads_step, lines)), None)
+        if last_step is not None:
+            step_count = int(last_step["id"].removeprefix("st_"))
+        else:
+            step_count = len(self._load_json(lineage_path)["steps"])
+
+        step_id = f"st_{step_count + 1:04d}"
         step = {
             "id": step_id,
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": now or _now_iso(),
             "operation": operation,
             "inputs": inputs or [],
             "outputs": outputs or [],
@@ -133,8 +211,7 @@ class DatasetRegistry:
         if llm_info:
             step["llm"] = llm_info
 
-        lineage["steps"].append(step)
-        self._save_json(lineage_path, lineage)
+        self._append_json_line(log_path, step)
 
         return step_id
 
@@ -148,7 +225,7 @@ class DatasetRegistry:
         """
         schema_path = self.storage_path / dataset_id / "schema.json"
         schema["dataset_id"] = dataset_id
-        schema["created_at"] = datetime.now(UTC).isoformat()
+        schema["created_at"] = _now_iso()
         self._save_json(schema_path, schema)
 
     def get_schema(self, dataset_id: str) -> Optional[Dict[str, Any]]:
@@ -178,12 +255,17 @@ class DatasetRegistry:
         Returns:
             Lineage if exists, None otherwise
         """
-        lineage_path = self.storage_path / dataset_id / "lineage.json"
+        dataset_path = self.storage_path / dataset_id
+        lineage_path = dataset_path / "lineage.json"
 
-        if lineage_path.exists():
-            return self._load_json(lineage_path)
+        if not lineage_path.exists():
+            return None
 
-        return None
+        lineage = self._load_json(lineage_path)
+        log_path = dataset_path / LINEAGE_LOG
+        if log_path.exists():
+            lineage["steps"].extend(self._load_json_lines(log_path))
+        return lineage
 
     def record_llm_artifact(
         self, dataset_id: str, artifact_name: str, content: Dict[str, Any]
@@ -203,17 +285,58 @@ class DatasetRegistry:
         llm_path.mkdir(exist_ok=True)
 
         artifact_path = llm_path / f"{artifact_name}.json"
-        content["timestamp"] = datetime.now(UTC).isoformat()
+        content["timestamp"] = _now_iso()
         self._save_json(artifact_path, content)
 
         return str(artifact_path)
 
     def _save_json(self, path: Path, data: Dict[str, Any]) -> None:
         """Save data as JSON."""
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        if orjson is not None:
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=_ORJSON_OPTIONS, default=str))
+        else:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+
+    def _append_json_line(self, path: Path, data: Dict[str, Any]) -> None:
+        """Append data as one compact JSON line."""
+        if orjson is not None:
+            line = orjson.dumps(data, option=_ORJSON_LINE_OPTIONS, default=str)
+        else:
+            line = json.dumps(data, default=str).encode()
+        with open(path, "a+b") as f:
+            # Start a new line after a torn (unterminated) last line
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line + b"\n")
+
+    def _load_json_lines(self, path: Path) -> List[Dict[str, Any]]:
+        """Load a JSON Lines file, skipping lines that are not valid JSON objects."""
+        records = map(self._loads_step, path.read_bytes().splitlines())
+        return [record for record in records if record is not None]
+
+    def _loads_step(self, line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one JSON Lines record; None for blank or torn lines."""
+        if not line:
+            return None
+        try:
+            record = self._loads(line)
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError
+            return None
+        return record if isinstance(record, dict) else None
+
+    @staticmethod
+    def _loads(data: bytes) -> Any:
+        """Parse JSON bytes."""
+        return orjson.loads(data) if orjson is not None else json.loads(data)
 
     def _load_json(self, path: Path) -> Dict[str, Any]:
         """Load JSON data."""
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with open(path, "r") as f:
             return json.load(f)
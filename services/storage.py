@@ -3,10 +3,36 @@ Storage Service
 Handles file I/O operations for various formats.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import xlsxwriter
+from pandas._libs.parsers import STR_NA_VALUES
 from pathlib import Path
-from typing import Optional, Union, Dict, List
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union, Dict, List, BinaryIO
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
 import hashlib
+import io
+import math
+import numbers
+import re
+import zipfile
+
+try:
+    import python_calamine  # noqa: F401
+
+    # Rust reader, used by pandas' "calamine" engine; much faster on .xlsx
+    _EXCEL_ENGINE = "calamine"
+except ImportError:  # optional speedup; pandas' default (openpyxl) otherwise
+    _EXCEL_ENGINE = None
+
+# A sheet is a DataFrame, or rows as tuples with the header row first (for
+# small fixed tables that don't need a DataFrame)
+SheetData = Union[pd.DataFrame, List[tuple]]
 
 
 class StorageService:
@@ -19,6 +45,8 @@ class StorageService:
         """
         Read Excel file.
 
+        Parsed with python-calamine when it is installed.
+
         Args:
             file_path: Path to Excel file
             sheet_name: Optional sheet name
@@ -26,13 +54,19 @@ class StorageService:
         Returns:
             DataFrame
         """
-        return pd.read_excel(file_path, sheet_name=sheet_name or 0)
+        return pd.read_excel(
+            file_path, sheet_name=sheet_name or 0, engine=_EXCEL_ENGINE
+        )
 
     @staticmethod
     def read_csv(file_path: Union[str, Path], **kwargs) -> pd.DataFrame:
         """
         Read CSV file.
 
+        Without extra arguments the file is parsed by PyArrow's multithreaded
+        reader into the same frame pd.read_csv returns; files PyArrow rejects
+        (e.g. ragged rows, duplicate headers) are read by pandas instead.
+
         Args:
             file_path: Path to CSV file
             **kwargs: Additional pandas read_csv arguments
@@ -40,6 +74,11 @@ class StorageService:
         Returns:
             DataFrame
         """
+        if not kwargs:
+            try:
+                return _read_csv_arrow(file_path)
+            except pa.ArrowInvalid:
+                pass
         return pd.read_csv(file_path, **kwargs)
 
     @staticmethod
@@ -56,10 +95,12 @@ class StorageService:
             SHA256 checksum of the file
         """
         file_path = Path(file_path)
-        df.to_parquet(file_path, index=False, **kwargs)
+        # Hash the bytes as they are written instead of reading the file back
+        with open(file_path, "wb") as f:
+            sink = _HashingWriter(f)
+            df.to_parquet(sink, index=False, **kwargs)
 
-        # Calculate checksum
-        return StorageService.calculate_checksum(file_path)
+        return sink.hexdigest()
 
     @staticmethod
     def read_parquet(
@@ -68,6 +109,9 @@ class StorageService:
         """
         Read Parquet file.
 
+        Only the requested columns are decoded; column chunks are fetched in
+        coalesced reads (pre_buffer) and decoded on multiple threads.
+
         Args:
             file_path: Path to Parquet file
             columns: Optional columns to read
@@ -75,7 +119,35 @@ class StorageService:
         Returns:
             DataFrame
         """
-        return pd.read_parquet(file_path, columns=columns)
+        table = pq.read_table(
+            file_path, columns=columns, use_threads=True, pre_buffer=True
+        )
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    @staticmethod
+    def read_parquet_batches(
+        file_path: Union[str, Path],
+        columns: Optional[List[str]] = None,
+        batch_size: int = 64_000,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream a Parquet file as Arrow record batches.
+
+        For consumers that can work chunk by chunk, so the whole file never
+        has to be held in memory at once.
+
+        Args:
+            file_path: Path to Parquet file
+            columns: Optional columns to read
+            batch_size: Maximum rows per batch
+
+        Yields:
+            Record batches, in file order
+        """
+        with pq.ParquetFile(file_path, pre_buffer=True) as parquet_file:
+            yield from parquet_file.iter_batches(
+                batch_size=batch_size, columns=columns
+            )
 
     @staticmethod
     def write_csv(df: pd.DataFrame, file_path: Union[str, Path], **kwargs) -> str:
@@ -94,9 +166,51 @@ class StorageService:
         df.to_csv(file_path, index=False, **kwargs)
         return str(file_path)
 
+    @staticmethod
+    def write_csv_arrow(
+        data: Union[pd.DataFrame, pa.Table], file_path: Union[str, Path]
+    ) -> str:
+        """
+        Write a DataFrame or Arrow Table to CSV, formatted with Arrow kernels.
+
+        Much faster than pandas' to_csv on large frames, with the same output as
+        to_csv(index=False): minimal quoting, True/False, repr floats and dates
+        without a time part when none has one (PyArrow's own CSV writer quotes
+        every string and writes full-precision timestamps). Tables with column
+        types this formatting does not cover (e.g. tz-aware timestamps) are
+        written by to_csv instead. The checksum is computed on the bytes as they
+        are written, so the file is never re-read.
+
+        Args:
+            data: DataFrame, or an already-converted Arrow Table (used as-is)
+            file_path: Output path
+
+        Returns:
+            SHA256 checksum of the file
+        """
+        file_path = Path(file_path)
+        if isinstance(data, pa.Table):
+            table = data
+        else:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+
+        if not all(map(_csv_formats, table.schema.types)):
+            df = data if isinstance(data, pd.DataFrame) else table.to_pandas()
+            df.to_csv(file_path, index=False)
+            return StorageService.calculate_checksum(file_path)
+
+        with open(file_path, "wb") as f:
+            sink = _HashingWriter(f)
+            header = _csv_fields(pa.array(table.column_names, pa.string()))
+            sink.write((",".join(header.to_pylist()) + "\n").encode())
+            for batch in table.to_batches(max_chunksize=_CSV_BATCH_ROWS):
+                sink.write(_csv_lines(batch.columns))
+
+        return sink.hexdigest()
+
     @staticmethod
     def write_excel(
-        data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+        data: Union[pd.DataFrame, Dict[str, SheetData]],
         file_path: Union[str, Path],
         with_formulas: bool = False,
     ) -> str:
@@ -104,7 +218,8 @@ class StorageService:
         Write DataFrame(s) to Excel.
 
         Args:
-            data: DataFrame or dict of sheet_name -> DataFrame
+            data: DataFrame or dict of sheet_name -> DataFrame or list of row
+                tuples (header first)
             file_path: Output path
             with_formulas: Whether to include formulas
 
@@ -112,17 +227,123 @@ class StorageService:
             Path to written file
         """
         file_path = Path(file_path)
+        StorageService._write_workbook(data, file_path, with_formulas)
+        return str(file_path)
+
+    @staticmethod
+    def write_excel_with_checksum(
+        data: Union[pd.DataFrame, Dict[str, SheetData]],
+        file_path: Union[str, Path],
+    ) -> str:
+        """
+        Write DataFrame(s) to Excel and return the file checksum.
+
+        The workbook is built in memory and hashed before it is written, so the
+        file is not read back from disk.
+
+        Args:
+            data: DataFrame or dict of sheet_name -> DataFrame
+            file_path: Output path
+
+        Returns:
+            SHA256 checksum of the file
+        """
+        buffer = io.BytesIO()
+        StorageService._write_workbook(data, buffer)
+        content = buffer.getbuffer()
+
+        with open(file_path, "wb") as f:
+            f.write(content)
+
+        return hashlib.sha256(content).hexdigest()
 
+    @staticmethod
+    def _write_workbook(
+        data: Union[pd.DataFrame, Dict[str, SheetData]],
+        target: Union[Path, BinaryIO],
+        with_formulas: bool = False,
+    ) -> None:
+        """
+        Write sheets to a path or binary buffer with xlsxwriter.
+
+        Rows are streamed straight from the frames with write_row, skipping the
+        per-cell objects pandas' to_excel builds. Layout matches to_excel with
+        index=False: a bold bordered header row, blanks for missing values and
+        "inf"/"-inf" text for infinities.
+        When writing to a path, each finished row is flushed to disk
+        (constant_memory) instead of the whole sheet being held in memory.
+        """
         if isinstance(data, pd.DataFrame):
             data = {"Sheet1": data}
 
-        with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
-            for sheet_name, df in data.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        workbook = xlsxwriter.Workbook(
+            target,
+            {
+                "default_date_format": "yyyy-mm-dd hh:mm:ss",
+                # Frames' infinities are already text; in row-tuple sheets
+                # +/-inf become #NUM! instead of failing
+                "nan_inf_to_errors": True,
+                # Rows are written strictly in order, as this mode requires;
+                # in-memory (buffer) targets ignore it
+                "constant_memory": not isinstance(target, io.IOBase),
+            },
+        )
+        header_format = workbook.add_format(
+            {"bold": True, "border": 1, "align": "center", "valign": "top"}
+        )
+        try:
+            for sheet_name, sheet in data.items():
+                worksheet = workbook.add_worksheet(sheet_name)
+                header, rows = _sheet_rows(sheet)
+                worksheet.write_row(0, 0, header, header_format)
+                for row_num, row in enumerate(rows, start=1):
+                    worksheet.write_row(row_num, 0, row)
 
                 if with_formulas:
                     # TODO: Add formula generation for audit
                     pass
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def write_excel_fast(
+        sheets: Dict[str, SheetData], file_path: Union[str, Path]
+    ) -> str:
+        """
+        Write sheets as a minimal XLSX package, streaming worksheet XML directly.
+
+        Bypasses the Excel libraries' per-cell bookkeeping for very large sheets:
+        strings are written inline (no shared-string table) and there is no
+        header styling. Numbers, booleans and datetimes keep their cell types.
+
+        Args:
+            sheets: Dict of sheet_name -> DataFrame or list of row tuples
+            file_path: Output path
+
+        Returns:
+            Path to written file
+        """
+        file_path = Path(file_path)
+        names = list(sheets)
+
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", _xlsx_content_types(len(names)))
+            zf.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+            zf.writestr("xl/workbook.xml", _xlsx_workbook(names))
+            zf.writestr("xl/_rels/workbook.xml.rels", _xlsx_workbook_rels(len(names)))
+            zf.writestr("xl/styles.xml", _XLSX_STYLES)
+
+            for index, name in enumerate(names, start=1):
+                header, rows = _sheet_rows(sheets[name])
+                with zf.open(f"xl/worksheets/sheet{index}.xml", "w") as raw:
+                    out = io.TextIOWrapper(raw, encoding="utf-8")
+                    out.write(_XLSX_SHEET_HEAD)
+                    out.write(_xlsx_row(header))
+                    for row in rows:
+                        out.write(_xlsx_row(row))
+                    out.write(_XLSX_SHEET_TAIL)
+                    out.flush()
+                    out.detach()
 
         return str(file_path)
 
@@ -137,11 +358,9 @@ class StorageService:
         Returns:
             SHA256 hex digest
         """
-        sha256_hash = hashlib.sha256()
+        # file_digest reads into its own buffer and hashes in C (OpenSSL)
         with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            return hashlib.file_digest(f, "sha256").hexdigest()
 
     @staticmethod
     def save_upload(file_content: bytes, file_path: Union[str, Path]) -> str:
@@ -161,4 +380,322 @@ class StorageService:
         with open(file_path, "wb") as f:
             f.write(file_content)
 
-        return StorageService.calculate_checksum(file_path)
+        # Hash the bytes already in memory instead of reading the file back
+        return hashlib.sha256(file_content).hexdigest()
+
+
+def _read_csv_arrow(file_path: Union[str, Path]) -> pd.DataFrame:
+    """pd.read_csv's default result, parsed with PyArrow's CSV reader."""
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=1 << 20)
+    # The same missing-value tokens as pandas (e.g. "None", which PyArrow keeps)
+    null_options = {"null_values": sorted(STR_NA_VALUES), "strings_can_be_null": True}
+    # Column types as inferred from the first block only
+    with pa_csv.open_csv(
+        file_path,
+        read_options=read_options,
+        convert_options=pa_csv.ConvertOptions(**null_options),
+    ) as reader:
+        schema = reader.schema
+    if len(set(schema.names)) != len(schema.names):
+        raise pa.ArrowInvalid("Duplicate column names")  # pandas renames them
+    if "" in schema.names:
+        # e.g. a trailing comma; pandas names these "Unnamed: N"
+        raise pa.ArrowInvalid("Empty column name")
+    if any(
+        pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type)
+        for field in schema
+    ):
+        # Not UTF-8 text; pandas raises UnicodeDecodeError rather than
+        # returning bytes objects
+        raise pa.ArrowInvalid("Column is not valid UTF-8")
+
+    # pandas keeps date/time text as strings; PyArrow would parse it
+    convert_options = pa_csv.ConvertOptions(
+        column_types={
+            field.name: pa.string()
+            for field in schema
+            if pa.types.is_temporal(field.type)
+        },
+        **null_options,
+    )
+    table = pa_csv.read_csv(
+        file_path, read_options=read_options, convert_options=convert_options
+    )
+    # All-empty columns are float NaN in pandas, not object None
+    for index, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(
+                index, field.name, table.column(index).cast(pa.float64())
+            )
+    # Missing text and booleans are NaN in pandas (object columns), not None
+    object_nulls = [
+        field.name
+        for field, column in zip(table.schema, table.columns)
+        if (pa.types.is_string(field.type) or pa.types.is_boolean(field.type))
+        and column.null_count
+    ]
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    for name in object_nulls:
+        df[name] = df[name].astype(object).fillna(float("nan"))
+    return df
+
+
+# Rows formatted per batch; keeps each batch's text well under the 2 GiB
+# limit of Arrow string offsets
+_CSV_BATCH_ROWS = 64 * 1024
+_CSV_NEEDS_QUOTES = '[",\r\n]'
+
+
+_TEMPORAL_UNITS = {"s": "second", "ms": "millisecond", "us": "microsecond"}
+
+
+def _csv_lines(columns: List[pa.Array]) -> pa.Buffer:
+    """CSV bytes for one batch of columns, each row ending in a newline."""
+    rows = pc.binary_join_element_wise(*map(_csv_fields, columns), ",")
+    if len(columns) == 1:
+        # A lone empty field is quoted so the row isn't read as blank
+        rows = pc.if_else(pc.equal(rows, ""), '""', rows)
+    lines = pc.binary_join_element_wise(rows, "", "\n")
+    # The data buffer of a fresh string array is the rows back to back
+    size = pc.sum(pc.binary_length(lines)).as_py() or 0
+    return lines.buffers()[2][:size] if size else pa.py_buffer(b"")
+
+
+def _csv_formats(kind: pa.DataType) -> bool:
+    """Whether _csv_fields formats values of this type exactly as to_csv does."""
+    if pa.types.is_dictionary(kind):
+        kind = kind.value_type
+    return (
+        pa.types.is_null(kind)
+        or pa.types.is_boolean(kind)
+        or pa.types.is_integer(kind)
+        or pa.types.is_floating(kind)
+        or pa.types.is_string(kind)
+        or pa.types.is_large_string(kind)
+        or (pa.types.is_timestamp(kind) and kind.tz is None)
+    )
+
+
+def _csv_fields(column: pa.Array) -> pa.Array:
+    """
+    A column's values as CSV fields, formatted the way pandas' to_csv does for
+    the types accepted by _csv_formats (other types are plainly cast to text).
+    """
+    kind = column.type
+    if pa.types.is_dictionary(kind):  # categoricals write their labels
+        column = column.cast(kind.value_type)
+        kind = column.type
+
+    if pa.types.is_boolean(kind):
+        text = pc.if_else(column, "True", "False")
+    elif pa.types.is_floating(kind):
+        # numpy's str() of a float is its repr, as written by pandas
+        values = column.to_numpy(zero_copy_only=False).astype(str)
+        mask = column.is_null(nan_is_null=True).to_numpy(zero_copy_only=False)
+        text = pa.array(values, pa.string(), mask=mask)
+    elif pa.types.is_timestamp(kind) and kind.tz is None:
+        text = _csv_timestamps(column)
+    else:
+        text = column.cast(pa.string())
+
+    # QUOTE_MINIMAL: only fields with a delimiter, quote or line break
+    quoted = pc.binary_join_element_wise(
+        '"', pc.replace_substring(text, '"', '""'), '"', ""
+    )
+    text = pc.if_else(pc.match_substring_regex(text, _CSV_NEEDS_QUOTES), quoted, text)
+    return pc.fill_null(text, "")
+
+
+def _csv_timestamps(column: pa.Array) -> pa.Array:
+    """
+    Naive timestamps as pandas writes them: dates only when every value is at
+    midnight, otherwise with seconds and only as many fraction digits as needed.
+    """
+
+    def whole(unit: str) -> bool:
+        exact = pc.equal(column, pc.floor_temporal(column, unit=unit))
+        return pc.all(exact).as_py() is not False
+
+    if whole("day"):
+        return pc.strftime(column, "%Y-%m-%d")
+    # %S includes the fraction of sub-second units (3, 6 or 9 digits)
+    unit = next(
+        (unit for unit in ("s", "ms", "us") if whole(_TEMPORAL_UNITS[unit])), "ns"
+    )
+    return pc.strftime(column.cast(pa.timestamp(unit)), "%Y-%m-%d %H:%M:%S")
+
+
+# Rows converted to Python objects at a time when streaming a frame to a sheet
+_SHEET_SLICE_ROWS = 64 * 1024
+
+
+def _sheet_rows(sheet: SheetData) -> Tuple[List[Any], Iterable[tuple]]:
+    """Split a sheet into its header and data rows of plain Python values."""
+    if isinstance(sheet, pd.DataFrame):
+        return list(sheet.columns), _frame_rows(sheet)
+    return list(sheet[0]), sheet[1:]
+
+
+def _frame_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """
+    A frame's rows as Python scalars with None for missing values (written as
+    blanks), boxed one row slice at a time rather than as a whole-frame copy.
+    Infinities become "inf"/"-inf" text, as pandas' to_excel writes them.
+    """
+    # Only float and object columns can hold infinities
+    float_like = [i for i, dtype in enumerate(df.dtypes) if dtype.kind in "fO"]
+    for start in range(0, len(df), _SHEET_SLICE_ROWS):
+        rows = df.iloc[start : start + _SHEET_SLICE_ROWS]
+        values = rows.astype(object).where(rows.notna(), None)
+        for position in float_like:
+            if rows.iloc[:, position].isin(_INFINITIES).any():
+                values.isetitem(position, values.iloc[:, position].map(_inf_text))
+        yield from values.itertuples(index=False, name=None)
+
+
+_INFINITIES = [math.inf, -math.inf]
+
+
+def _inf_text(value: Any) -> Any:
+    """+/-inf as to_excel's default inf_rep text; other values unchanged."""
+    if isinstance(value, float) and math.isinf(value):
+        return "inf" if value > 0 else "-inf"
+    return value
+
+
+_XML_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XLSX_ROOT_RELS = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" '
+    f'Target="xl/workbook.xml"/>'
+    f"</Relationships>"
+)
+# Style 0 is the default; style 1 is a datetime number format
+_XLSX_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<styleSheet xmlns="{_XML_NS}">'
+    f'<numFmts count="1">'
+    f'<numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    f'<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    f'<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    f'<borders count="1"><border/></borders>'
+    f'<cellStyleXfs count="1">'
+    f'<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    f'<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    f'<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" '
+    f'applyNumberFormat="1"/></cellXfs>'
+    f'<cellStyles count="1">'
+    f'<cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    f"</styleSheet>"
+)
+_XLSX_SHEET_HEAD = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    f'<worksheet xmlns="{_XML_NS}"><sheetData>'
+)
+_XLSX_SHEET_TAIL = "</sheetData></worksheet>"
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+# Characters XML 1.0 cannot carry, even escaped
+_XML_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_content_types(sheet_count: int) -> str:
+    sheets = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+        f'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f"{sheets}</Types>"
+    )
+
+
+def _xlsx_workbook(names: List[str]) -> str:
+    sheets = "".join(
+        f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(names, start=1)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<workbook xmlns="{_XML_NS}" xmlns:r="{_REL_NS}"><sheets>{sheets}</sheets>'
+        f"</workbook>"
+    )
+
+
+def _xlsx_workbook_rels(sheet_count: int) -> str:
+    rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" '
+        f'Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    styles_id = sheet_count + 1
+    return (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<Relationships xmlns="{_PKG_REL_NS}">{rels}'
+        f'<Relationship Id="rId{styles_id}" Type="{_REL_NS}/styles" '
+        f'Target="styles.xml"/>'
+        f"</Relationships>"
+    )
+
+
+def _xlsx_row(values) -> str:
+    """One <row> of cells; positions are implicit, so blanks are empty <c/>."""
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (bool, np.bool_)):
+            cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, numbers.Integral):  # includes numpy integers
+            cells.append(f"<c><v>{int(value)}</v></c>")
+        elif isinstance(value, numbers.Real):  # repr of np.float64 isn't a number
+            value = float(value)
+            if not math.isfinite(value):
+                cells.append('<c t="e"><v>#NUM!</v></c>')
+            else:
+                cells.append(f"<c><v>{value!r}</v></c>")
+        elif isinstance(value, datetime):
+            # Excel has no time zones: keep the local wall time, as xlsxwriter's
+            # remove_timezone option does
+            value = value.replace(tzinfo=None)
+            serial = (value - _EXCEL_EPOCH).total_seconds() / 86400
+            cells.append(f'<c s="1"><v>{serial!r}</v></c>')
+        else:
+            text = escape(_XML_ILLEGAL_CHARS.sub("", str(value)))
+            cells.append(
+                f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+            )
+    return f"<row>{''.join(cells)}</row>"
+
+
+class _HashingWriter:
+    """Binary file wrapper that hashes bytes as they are written."""
+
+    def __init__(self, f):
+        self._f = f
+        self._hash = hashlib.sha256()
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._hash.update(data)
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        self.closed = True
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
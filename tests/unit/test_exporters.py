@@ -99,6 +99,30 @@ class TestExportService:
         unique_thresholds = sorted(set(threshold_numbers))
         assert unique_thresholds == [5, 25, 75, 100]
     
+    def test_csv_and_summary_round_halfway_percentages_alike(self, temp_dir: Path):
+        """Test a halfway percentage is rounded the same in the CSV and the Summary sheet."""
+        results = {
+            "by_period": [
+                {
+                    "period": "2023-Q1",
+                    "total": 1000.0,
+                    "concentration": {
+                        "top_10": {"count": 1, "value": 3.5, "percentage": 0.35},
+                    }
+                }
+            ]
+        }
+        csv_path = temp_dir / "halfway.csv"
+        excel_path = temp_dir / "halfway.xlsx"
+        
+        ExportService.export_concentration_csv(results, csv_path)
+        ExportService.export_concentration_excel(results, excel_path, include_formulas=False)
+        
+        csv_df = pd.read_csv(csv_path)
+        summary_df = pd.read_excel(excel_path, sheet_name="Summary")
+        assert csv_df["pct_of_total"].tolist() == [0.3]
+        assert summary_df["top_10_pct"].tolist() == [0.3]
+    
     def test_export_concentration_csv(self, temp_dir: Path, sample_concentration_results: Dict[str, Any]):
         """Test CSV export with correct rows per (period, threshold)."""
         csv_path = temp_dir / "concentration_results.csv"
@@ -265,7 +289,7 @@ class TestExportService:
         assert params_dict["Group By"] == "Company"
         assert params_dict["Value Column"] == "Revenue"
         assert params_dict["Time Column"] == "Date"
-        assert params_dict["Thresholds"] == "[10, 20, 50]"
+        assert params_dict["Thresholds"] == "10,20,50"
     
     def test_export_concentration_excel_without_details(self, temp_dir: Path):
         """Test Excel export when details are missing."""
@@ -293,6 +317,87 @@ class TestExportService:
         assert "Parameters" in sheet_names
         assert "Details" not in sheet_names
     
+    def test_export_concentration_excel_uses_flat_summary(self, temp_dir: Path):
+        """Test a published by_period_flat is written as the Summary sheet as-is."""
+        excel_path = temp_dir / "flat_summary.xlsx"
+        
+        period = {
+            "period": "2023",
+            "total": 1000.0,
+            "concentration": {"top_10": {"count": 1, "value": 400.0, "percentage": 40.0}}
+        }
+        flat_row = ExportService.summary_row("2023", period)
+        assert flat_row == {
+            "period": "2023", "total": 1000.0,
+            "top_10_count": 1, "top_10_value": 400.0, "top_10_pct": 40.0
+        }
+        
+        results = {"by_period": [period], "by_period_flat": [flat_row]}
+        ExportService.export_concentration_excel(results, excel_path)
+        
+        summary_df = pd.read_excel(excel_path, sheet_name="Summary")
+        assert list(summary_df.columns) == list(flat_row)
+        assert summary_df["top_10_pct"].iloc[0] == 40.0
+    
+    def test_export_concentration_excel_details_schema(self, temp_dir: Path):
+        """Test details_schema fixes Details column order and dtypes."""
+        excel_path = temp_dir / "details_schema.xlsx"
+        
+        results = {
+            "by_period": [{"period": "2023", "total": 300.0}],
+            "details": [
+                {"Revenue": 200.0, "Company": "A", "period": "2023"},
+                {"Revenue": 100.0, "Company": "B", "period": "2023"}
+            ],
+            "details_schema": {
+                "columns": ["period", "Company", "Revenue"],
+                "dtypes": {"Revenue": "float64"}
+            }
+        }
+        
+        details_df = ExportService._details_frame(results)
+        assert list(details_df.columns) == ["period", "Company", "Revenue"]
+        assert details_df["Revenue"].dtype == "float64"
+        
+        ExportService.export_concentration_excel(results, excel_path)
+        read_df = pd.read_excel(excel_path, sheet_name="Details")
+        assert list(read_df.columns) == ["period", "Company", "Revenue"]
+    
+    def test_details_schema_mismatch_falls_back_to_inference(self):
+        """Test a dtype the records don't fit is dropped instead of failing."""
+        results = {
+            "details": [
+                {"period": "2023", "Revenue": 200.0},
+                {"period": "2024", "Revenue": "n/a"}
+            ],
+            "details_schema": {
+                "columns": ["period", "Revenue"],
+                "dtypes": {"Revenue": "float64"}
+            }
+        }
+        
+        details_df = ExportService._details_frame(results)
+        assert details_df["Revenue"].tolist() == [200.0, "n/a"]
+    
+    def test_export_concentration_excel_top_entities_sheet(self, temp_dir: Path):
+        """Test Top_Entities sheet adds period and rank columns after entity fields."""
+        excel_path = temp_dir / "top_entities.xlsx"
+        
+        results = {
+            "by_period": [
+                {"period": "2023", "head_sample": [{"Company": f"C{i}", "Revenue": 100 - i} for i in range(12)]},
+                {"period": "2024", "head_sample": [{"Company": "A", "Revenue": 50}]}
+            ]
+        }
+        
+        ExportService.export_concentration_excel(results, excel_path)
+        
+        top_df = pd.read_excel(excel_path, sheet_name="Top_Entities")
+        assert list(top_df.columns) == ["Company", "Revenue", "period", "rank"]
+        assert len(top_df) == 11  # 10 for 2023 (capped) + 1 for 2024
+        assert top_df["rank"].tolist() == list(range(1, 11)) + [1]
+        assert top_df["period"].astype(str).tolist() == ["2023"] * 10 + ["2024"]
+    
     def test_export_concentration_excel_with_formulas(self, temp_dir: Path, sample_concentration_results: Dict[str, Any]):
         """Test Excel export with formulas enabled."""
         excel_path = temp_dir / "with_formulas.xlsx"
@@ -432,6 +537,16 @@ class TestExportService:
         assert df.iloc[0]["threshold"] == 10
         assert df.iloc[0]["count"] == 1
     
+    def test_csv_empty_results_keeps_header(self, temp_dir: Path):
+        """Test that an export with no thresholds still writes the CSV header."""
+        csv_path = temp_dir / "header_only.csv"
+        
+        ExportService.export_concentration_csv({"by_period": []}, csv_path)
+        
+        df = pd.read_csv(csv_path)
+        assert len(df) == 0
+        assert list(df.columns) == ["period", "threshold", "count", "value", "pct_of_total"]
+    
     def test_path_string_and_pathlib_compatibility(self, temp_dir: Path, sample_concentration_results: Dict[str, Any]):
         """Test that export functions accept both string and Path objects."""
         # Test with Path objects
@@ -0,0 +1,36 @@
+"""
+Unit tests for the test fixture generator script.
+"""
+import pandas as pd
+from pathlib import Path
+
+from scripts.generate_test_fixtures import write_sample_files
+from services.storage import StorageService
+
+
+class TestWriteSampleFiles:
+    """Test cases for write_sample_files."""
+
+    def test_csv_sample(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test a CSV sample is written with its metadata and checksum."""
+        metadata = write_sample_files(temp_dir, sample_df, "sample", "test sample", ("csv",))
+
+        csv_path = temp_dir / metadata["csv"]["path"]
+        assert metadata["rows"] == len(sample_df)
+        assert metadata["columns"] == len(sample_df.columns)
+        assert csv_path.read_text() == sample_df.to_csv(index=False)
+        assert metadata["csv"]["checksum"] == StorageService.calculate_checksum(csv_path)
+        assert "excel" not in metadata
+
+    def test_csv_sample_with_mixed_type_column(self, temp_dir: Path):
+        """Test object columns mixing ints and strings fall back to pandas' writer."""
+        df = pd.DataFrame({
+            "id": [1, "A-2", 3],
+            "value": [1.5, 2.0, 3.25],
+        })
+
+        metadata = write_sample_files(temp_dir, df, "mixed", "mixed types", ("csv",))
+
+        csv_path = temp_dir / metadata["csv"]["path"]
+        assert csv_path.read_text() == df.to_csv(index=False)
+        assert metadata["csv"]["checksum"] == StorageService.calculate_checksum(csv_path)
@@ -0,0 +1,476 @@
+"""
+Tests for LLMClient.
+"""
+import asyncio
+import json
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from services.llm_client import (
+    LLMClient,
+    LLMRequestMetrics,
+    LLMUsageError,
+    LLMValidationError,
+    _extract_json_span,
+    _json_candidates,
+)
+
+
+def _completion(content: str) -> dict:
+    """Minimal OpenAI chat completion payload."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4.1-mini",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+class Answer(BaseModel):
+    """Response model used by the tests."""
+
+    value: int
+
+
+@pytest.fixture
+def client() -> LLMClient:
+    """Client with only a stub OpenAI provider configured."""
+    llm_client = LLMClient()
+    llm_client._clients = {"openai": {"api_key": "test-key", "timeout": 5}}
+    return llm_client
+
+
+@pytest.fixture
+def provider_calls(client: LLMClient, monkeypatch) -> List[dict]:
+    """Stub client.chat; records each provider call and answers {"value": 1}."""
+    calls = []
+
+    async def chat(messages, model=None, provider=None, request_id=None, **kwargs):
+        calls.append({"messages": messages, "provider": provider})
+        await asyncio.sleep(0)
+        return '{"value": 1}', LLMRequestMetrics(
+            provider=provider,
+            model=model or "gpt-4.1-mini",
+            latency_ms=1,
+            request_id=request_id,
+        )
+
+    monkeypatch.setattr(client, "chat", chat)
+    return calls
+
+
+class TestProviderClients:
+    """Test provider client lifecycle."""
+
+    def test_clients_are_built_per_event_loop(self, client: LLMClient, monkeypatch):
+        """Test separate asyncio.run calls each get working clients."""
+        http_clients = []
+
+        def make_http_client():
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(200, json=_completion('{"ok": true}'))
+            )
+            http_client = httpx.AsyncClient(transport=transport)
+            http_clients.append(http_client)
+            return http_client
+
+        monkeypatch.setattr(client, "_http_client", make_http_client)
+        messages = [{"role": "user", "content": "ping"}]
+
+        # Each asyncio.run is a fresh loop, as in the sync wrappers
+        for _ in range(2):
+            content, metrics = asyncio.run(client.chat(messages, provider="openai"))
+            assert json.loads(content) == {"ok": True}
+            assert metrics.error is None
+
+        assert len(http_clients) == 2
+
+        async def two_calls():
+            await client.chat(messages, provider="openai")
+            await client.chat(messages, provider="openai")
+
+        # Calls on the same loop reuse that loop's client
+        asyncio.run(two_calls())
+        assert len(http_clients) == 3
+
+
+    def test_run_in_loop_closes_clients(self, client: LLMClient, monkeypatch):
+        """Test a one-shot loop's http client is closed when asyncio.run finishes."""
+        http_clients = []
+
+        def make_http_client():
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(200, json=_completion('{"ok": true}'))
+            )
+            http_client = httpx.AsyncClient(transport=transport)
+            http_clients.append(http_client)
+            return http_client
+
+        monkeypatch.setattr(client, "_http_client", make_http_client)
+        messages = [{"role": "user", "content": "ping"}]
+
+        content, _ = asyncio.run(
+            client.run_in_loop(client.chat(messages, provider="openai"))
+        )
+
+        assert json.loads(content) == {"ok": True}
+        assert len(http_clients) == 1
+        assert http_clients[0].is_closed
+        assert len(client._loop_clients) == 0
+
+
+class TestDiskCache:
+    """Test the opt-in persistent response cache."""
+
+    def test_disk_write_failure_does_not_fail_request(
+        self, client: LLMClient, provider_calls: List[dict], temp_dir: Path, monkeypatch
+    ):
+        """Test an unwritable cache dir still returns the provider response."""
+        blocker = temp_dir / "not_a_dir"
+        blocker.write_text("")
+        monkeypatch.setattr(
+            "services.llm_client.settings.llm_response_cache_dir", blocker / "cache"
+        )
+
+        response, metrics = asyncio.run(
+            client.chat_json(
+                [{"role": "user", "content": "q"}],
+                response_model=Answer,
+                provider="openai",
+            )
+        )
+
+        assert response == {"value": 1}
+        assert metrics.cached is False
+        assert len(provider_calls) == 1
+
+    def test_stale_disk_entry_is_revalidated(
+        self, client: LLMClient, provider_calls: List[dict], temp_dir: Path, monkeypatch
+    ):
+        """Test a disk hit that no longer matches the model is treated as a miss."""
+        monkeypatch.setattr(
+            "services.llm_client.settings.llm_response_cache_dir", temp_dir
+        )
+        messages = [{"role": "user", "content": "q"}]
+        request = dict(messages=messages, response_model=Answer, provider="openai")
+
+        asyncio.run(client.chat_json(**request))
+        (cache_file,) = temp_dir.glob("*.json")
+
+        # A valid entry is served without a provider call
+        response, metrics = asyncio.run(client.chat_json(**request))
+        assert metrics.cached is True
+        assert len(provider_calls) == 1
+
+        # An entry written under an older schema is not
+        cache_file.write_text(json.dumps({"response": {"value": "n/a"}}))
+        response, metrics = asyncio.run(client.chat_json(**request))
+        assert response == {"value": 1}
+        assert metrics.cached is False
+        assert len(provider_calls) == 2
+
+
+class FakeClock:
+    """Controllable stand-in for the client's monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    """Test the in-memory LRU/TTL response cache."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch) -> FakeClock:
+        clock = FakeClock()
+        monkeypatch.setattr("services.llm_client._monotonic", clock)
+        return clock
+
+    def test_evicts_least_recently_used(self, client: LLMClient):
+        """Test capacity eviction drops the least recently used entry."""
+        client._cache_max_entries = 2
+        client._cache_response("a", {"n": 1}, "openai", "m")
+        client._cache_response("b", {"n": 2}, "openai", "m")
+
+        # Reading "a" makes "b" the least recently used
+        assert client._check_cache("a") == {"n": 1}
+        client._cache_response("c", {"n": 3}, "openai", "m")
+
+        assert list(client._cache) == ["a", "c"]
+        assert client._check_cache("b") is None
+
+    def test_expired_entry_is_a_miss(self, client: LLMClient, clock: FakeClock):
+        """Test reading an entry past its TTL drops it."""
+        client._cache_ttl = 10
+        client._cache_response("a", {"n": 1}, "openai", "m")
+
+        clock.now = 11
+        assert client._check_cache("a") is None
+        assert "a" not in client._cache
+
+    def test_sweep_drops_only_expired_entries(self, client: LLMClient, clock: FakeClock):
+        """Test the periodic sweep removes expired entries in expiry order."""
+        client._cache_ttl = 10
+        client.CACHE_SWEEP_INTERVAL = 3
+        client._cache_response("a", {"n": 1}, "openai", "m")
+        clock.now = 5
+        client._cache_response("b", {"n": 2}, "openai", "m")
+
+        # The third insert triggers a sweep: only "a" is past its TTL
+        clock.now = 12
+        client._cache_response("c", {"n": 3}, "openai", "m")
+
+        assert list(client._cache) == ["b", "c"]
+        assert sorted(key for _, key in client._cache_expiry) == ["b", "c"]
+        assert client._inserts_since_sweep == 0
+
+    def test_sweep_skips_recached_keys(self, client: LLMClient, clock: FakeClock):
+        """Test a stale heap record does not evict a key cached again later."""
+        client._cache_ttl = 10
+        client._cache_response("a", {"n": 1}, "openai", "m")
+        clock.now = 8
+        client._cache_response("a", {"n": 2}, "openai", "m")
+
+        clock.now = 12  # the first record has expired, the entry has not
+        client._sweep_cache()
+
+        assert client._check_cache("a") == {"n": 2}
+
+    def test_sweep_rebuilds_heap_of_stale_records(self, client: LLMClient):
+        """Test heap records for overwritten keys are compacted."""
+        for _ in range(3 * client.CACHE_SWEEP_INTERVAL):
+            client._cache_response("a", {"n": 1}, "openai", "m")
+
+        assert len(client._cache) == 1
+        assert len(client._cache_expiry) <= 2 * client.CACHE_SWEEP_INTERVAL
+
+
+class TestRequestCoalescing:
+    """Test identical in-flight requests share one provider call."""
+
+    def test_concurrent_identical_calls_make_one_provider_call(
+        self, client: LLMClient, provider_calls: List[dict]
+    ):
+        """Test two concurrent identical calls issue exactly one provider call."""
+        messages = [{"role": "user", "content": "q"}]
+
+        async def run():
+            return await asyncio.gather(
+                client.chat_json(messages, provider="openai", request_id="r1"),
+                client.chat_json(messages, provider="openai", request_id="r2"),
+            )
+
+        (first, first_metrics), (second, second_metrics) = asyncio.run(run())
+
+        assert len(provider_calls) == 1
+        assert first == second == {"value": 1}
+        # Each caller gets its own metrics object
+        assert first_metrics is not second_metrics
+        assert [first_metrics.request_id, second_metrics.request_id] == ["r1", "r2"]
+        assert client._inflight == {}
+
+    def test_waiters_share_the_exception(self, client: LLMClient, monkeypatch):
+        """Test a failed shared call raises in every waiting caller."""
+        calls = []
+
+        async def chat(messages, **kwargs):
+            calls.append(messages)
+            await asyncio.sleep(0)
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(client, "chat", chat)
+        messages = [{"role": "user", "content": "q"}]
+
+        async def run():
+            return await asyncio.gather(
+                client.chat_json(messages, provider="openai"),
+                client.chat_json(messages, provider="openai"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert client._inflight == {}
+
+
+class TestUsageLimits:
+    """Test per-dataset provider call accounting."""
+
+    def test_provider_calls_are_counted_up_to_the_limit(
+        self, client: LLMClient, provider_calls: List[dict]
+    ):
+        """Test calls are claimed per dataset and refused past the limit."""
+        client._max_calls = 1
+        asyncio.run(
+            client.chat_json(
+                [{"role": "user", "content": "q1"}], provider="openai", dataset_id="ds"
+            )
+        )
+
+        with pytest.raises(LLMUsageError):
+            asyncio.run(
+                client.chat_json(
+                    [{"role": "user", "content": "q2"}], provider="openai", dataset_id="ds"
+                )
+            )
+        assert client._usage_tracker["ds"] == 1
+        assert len(provider_calls) == 1
+
+    def test_failed_call_is_refunded(self, client: LLMClient, monkeypatch):
+        """Test a provider exception releases the claimed call."""
+
+        async def chat(messages, **kwargs):
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(client, "chat", chat)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(
+                client.chat_json(
+                    [{"role": "user", "content": "q"}], provider="openai", dataset_id="ds"
+                )
+            )
+        assert client._usage_tracker["ds"] == 0
+
+    def test_cancelled_call_is_refunded(self, client: LLMClient, monkeypatch):
+        """Test cancelling a request releases the claimed call."""
+
+        async def chat(messages, **kwargs):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(client, "chat", chat)
+
+        async def run():
+            task = asyncio.create_task(
+                client.chat_json(
+                    [{"role": "user", "content": "q"}], provider="openai", dataset_id="ds"
+                )
+            )
+            await asyncio.sleep(0)
+            assert client._usage_tracker["ds"] == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert client._usage_tracker["ds"] == 0
+
+    def test_reset_during_failed_call_keeps_provider_error(
+        self, client: LLMClient, monkeypatch
+    ):
+        """Test resetting usage mid-call neither masks the error nor refunds other calls."""
+        client.reset_usage()
+
+        async def chat(messages, **kwargs):
+            client.reset_usage("ds")
+            # A new call re-claims the dataset after the reset
+            client._incr_or_raise("ds")
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(client, "chat", chat)
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            asyncio.run(
+                client.chat_json(
+                    [{"role": "user", "content": "q"}], provider="openai", dataset_id="ds"
+                )
+            )
+        assert client._usage_tracker["ds"] == 1
+
+        async def chat_after_clear(messages, **kwargs):
+            client.reset_usage()
+            raise RuntimeError("provider down")
+
+        monkeypatch.setattr(client, "chat", chat_after_clear)
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            asyncio.run(
+                client.chat_json(
+                    [{"role": "user", "content": "q2"}], provider="openai", dataset_id="ds"
+                )
+            )
+        assert "ds" not in client._usage_tracker
+
+
+class TestJsonExtraction:
+    """Test locating the JSON object in a raw response."""
+
+    def test_span_ignores_braces_inside_strings(self):
+        """Test braces and escaped quotes inside strings don't end the object."""
+        text = 'Result: {"note": "a } and \\"{\\" inside", "n": 1} trailing }'
+        assert json.loads(_extract_json_span(text)) == {
+            "note": 'a } and "{" inside',
+            "n": 1,
+        }
+
+    def test_span_handles_escaped_backslash_before_quote(self):
+        """Test an escaped backslash does not escape the closing quote."""
+        text = '{"path": "C:\\\\", "n": {"m": 2}} {"other": 3}'
+        assert json.loads(_extract_json_span(text)) == {"path": "C:\\", "n": {"m": 2}}
+
+    def test_span_without_object(self):
+        """Test text without a complete object yields None."""
+        assert _extract_json_span("no json here") is None
+        assert _extract_json_span('{"unclosed": 1') is None
+
+    def test_candidates_try_outer_slice_then_first_object(self):
+        """Test multiple objects yield the outer slice, then the first object."""
+        text = 'First {"value": 1} then {"value": 2}.'
+        assert list(_json_candidates(text)) == [
+            '{"value": 1} then {"value": 2}',
+            '{"value": 1}',
+        ]
+
+    def test_candidates_single_object(self):
+        """Test a single wrapped object is yielded once."""
+        assert list(_json_candidates('Sure: {"value": 1}!')) == ['{"value": 1}']
+        assert list(_json_candidates("} no object {")) == []
+
+
+class TestParseResponse:
+    """Test parsing and validating raw responses."""
+
+    def test_pure_json_with_model(self, client: LLMClient):
+        """Test plain JSON is validated and coerced by the model."""
+        assert client._parse_response(' {"value": "3"} ', Answer) == {"value": 3}
+
+    def test_falls_back_to_embedded_object(self, client: LLMClient):
+        """Test malformed JSON falls back to the object embedded in prose."""
+        assert client._parse_response('Sure! {"value": 3} Done.', Answer) == {"value": 3}
+
+    def test_falls_back_to_first_of_several_objects(self, client: LLMClient):
+        """Test the first balanced object is used when the outer slice is invalid."""
+        text = '{"value": 1} and also {"value": 2}'
+        assert client._parse_response(text, Answer) == {"value": 1}
+        assert client._parse_response(text) == {"value": 1}
+
+    def test_schema_mismatch_is_not_retried(self, client: LLMClient):
+        """Test valid JSON failing the model raises a validation error."""
+        with pytest.raises(LLMValidationError, match="Response validation failed"):
+            client._parse_response('{"other": 1}', Answer)
+
+    def test_no_json(self, client: LLMClient):
+        """Test text with no object reports that no JSON was found."""
+        with pytest.raises(LLMValidationError, match="No JSON found"):
+            client._parse_response("I cannot answer that.", Answer)
+
+    def test_invalid_json(self, client: LLMClient):
+        """Test unparseable candidates report invalid JSON."""
+        with pytest.raises(LLMValidationError, match="Invalid JSON response"):
+            client._parse_response("Here: {value: 1}", Answer)
@@ -152,6 +152,72 @@ class TestDatasetRegistry:
         assert lineage["steps"][0]["id"] == step_id_1
         assert lineage["steps"][1]["id"] == step_id_2
     
+    def test_append_lineage_step_appends_to_log(self, registry: DatasetRegistry, mock_datasets_path: Path):
+        """Test steps go to the append-only log and legacy header steps are kept."""
+        dataset_id = registry.create_dataset("test.xlsx")
+        dataset_path = mock_datasets_path / dataset_id
+        
+        # Simulate a dataset written before the log existed
+        lineage_file = dataset_path / "lineage.json"
+        with open(lineage_file, "r") as f:
+            lineage = json.load(f)
+        lineage["steps"].append({"id": "st_0001", "operation": "upload"})
+        with open(lineage_file, "w") as f:
+            json.dump(lineage, f)
+        
+        step_id = registry.append_lineage_step(dataset_id, "normalize")
+        assert step_id == "st_0002"
+        
+        # The header is not rewritten; the new step is one line in the log
+        with open(lineage_file, "r") as f:
+            assert len(json.load(f)["steps"]) == 1
+        log_lines = (dataset_path / "lineage_steps.jsonl").read_text().splitlines()
+        assert len(log_lines) == 1
+        assert json.loads(log_lines[0])["id"] == "st_0002"
+        
+        # Later steps are numbered from the log's last line, however long it is
+        large_params = {"values": list(range(5000))}
+        assert registry.append_lineage_step(dataset_id, "analyze", params=large_params) == "st_0003"
+        assert registry.append_lineage_step(dataset_id, "export") == "st_0004"
+        
+        lineage = registry.get_lineage(dataset_id)
+        assert [step["id"] for step in lineage["steps"]] == [
+            "st_0001", "st_0002", "st_0003", "st_0004"
+        ]
+    
+    def test_append_lineage_step_after_torn_last_line(self, registry: DatasetRegistry, mock_datasets_path: Path):
+        """Test a truncated last log line (crash mid-append) is skipped, not fatal."""
+        dataset_id = registry.create_dataset("test.xlsx")
+        registry.append_lineage_step(dataset_id, "upload")
+        registry.append_lineage_step(dataset_id, "normalize")
+        
+        # Simulate a crash partway through writing a third step
+        log_path = mock_datasets_path / dataset_id / "lineage_steps.jsonl"
+        with open(log_path, "ab") as f:
+            f.write(b'{"id": "st_0003", "operation": "ana')
+        
+        lineage = registry.get_lineage(dataset_id)
+        assert [step["id"] for step in lineage["steps"]] == ["st_0001", "st_0002"]
+        
+        # The torn step is re-used and the new step starts on its own line
+        assert registry.append_lineage_step(dataset_id, "analyze") == "st_0003"
+        assert registry.append_lineage_step(dataset_id, "export") == "st_0004"
+        lineage = registry.get_lineage(dataset_id)
+        assert [step["operation"] for step in lineage["steps"]] == [
+            "upload", "normalize", "analyze", "export"
+        ]
+    
+    def test_append_lineage_step_with_shared_timestamp(self, registry: DatasetRegistry):
+        """Test related steps can share one caller-supplied timestamp."""
+        dataset_id = registry.create_dataset("test.xlsx")
+        now = "2024-01-15T10:30:00.000000+00:00"
+        
+        registry.append_lineage_step(dataset_id, "upload", now=now)
+        registry.append_lineage_step(dataset_id, "normalize", now=now)
+        
+        lineage = registry.get_lineage(dataset_id)
+        assert [step["timestamp"] for step in lineage["steps"]] == [now, now]
+    
     def test_append_lineage_step_nonexistent_dataset(self, registry: DatasetRegistry):
         """Test appending to non-existent dataset."""
         with pytest.raises(DatasetNotFoundError, match="Lineage file not found for dataset nonexistent"):
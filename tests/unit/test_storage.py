@@ -7,6 +7,7 @@ import numpy as np
 from pathlib import Path
 import tempfile
 import hashlib
+from datetime import datetime
 from openpyxl import load_workbook
 
 from services.storage import StorageService
@@ -26,6 +27,7 @@ class TestStorageService:
         assert parquet_path.exists()
         assert isinstance(checksum, str)
         assert len(checksum) == 64  # SHA256 hex length
+        assert checksum == StorageService.calculate_checksum(parquet_path)
         
         # Read parquet and verify data integrity
         read_df = StorageService.read_parquet(parquet_path)
@@ -45,6 +47,21 @@ class TestStorageService:
         expected_df = sample_df[columns_to_read]
         pd.testing.assert_frame_equal(expected_df, read_df)
     
+    def test_parquet_read_batches(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test streaming Parquet batches with column projection."""
+        parquet_path = temp_dir / "test_batches.parquet"
+        StorageService.write_parquet(sample_df, parquet_path)
+        
+        columns = list(sample_df.columns[:2])
+        batches = list(
+            StorageService.read_parquet_batches(parquet_path, columns=columns, batch_size=2)
+        )
+        
+        assert all(batch.num_rows <= 2 for batch in batches)
+        assert all(batch.schema.names == columns for batch in batches)
+        read_df = pd.concat([batch.to_pandas() for batch in batches], ignore_index=True)
+        pd.testing.assert_frame_equal(sample_df[columns], read_df)
+    
     def test_parquet_with_various_dtypes(self, temp_dir: Path):
         """Test parquet round-trip with various data types."""
         df_with_types = pd.DataFrame({
@@ -85,6 +102,130 @@ class TestStorageService:
         read_df = StorageService.read_csv(csv_path, sep=";")
         pd.testing.assert_frame_equal(sample_df, read_df)
     
+    def test_csv_read_matches_pandas(self, temp_dir: Path):
+        """Test the default CSV read returns the same frame as pd.read_csv."""
+        csv_path = temp_dir / "test_mixed.csv"
+        csv_path.write_text(
+            "date,customer,revenue,active\n"
+            "2024-01-15,Acme,1.5,true\n"
+            "2024-02-01,,\"1,000\",false\n"
+            "2024-03-01T10:00:00,Beta,,true\n"
+        )
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+        assert read_df["date"].tolist()[0] == "2024-01-15"  # dates stay text
+    
+    def test_csv_read_pandas_missing_value_tokens(self, temp_dir: Path):
+        """Test the default CSV read treats pandas' NA tokens (e.g. None) as missing."""
+        csv_path = temp_dir / "test_na_tokens.csv"
+        csv_path.write_text(
+            "customer,revenue\n"
+            "Acme,None\n"
+            "None,<NA>\n"
+            "Beta,2.5\n"
+        )
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+        assert read_df["customer"].isna().tolist() == [False, True, False]
+    
+    def test_csv_read_all_empty_column(self, temp_dir: Path):
+        """Test a column with no values is read as float NaN, as pandas does."""
+        csv_path = temp_dir / "test_empty_column.csv"
+        csv_path.write_text("customer,notes,revenue\nAcme,,1\nBeta,,2\n")
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+        assert read_df["notes"].dtype == "float64"
+    
+    def test_csv_read_empty_header_name(self, temp_dir: Path):
+        """Test an empty header cell (trailing comma) gets pandas' "Unnamed: N" name."""
+        csv_path = temp_dir / "test_trailing_comma.csv"
+        csv_path.write_text("customer,revenue,\nAcme,1,\nBeta,2,\n")
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+        assert list(read_df.columns) == ["customer", "revenue", "Unnamed: 2"]
+    
+    def test_csv_read_bool_column_with_blanks(self, temp_dir: Path):
+        """Test missing values in a boolean column are NaN, as pandas reads them."""
+        csv_path = temp_dir / "test_bool_blanks.csv"
+        csv_path.write_text("customer,active\nAcme,true\nBeta,\nGamma,false\n")
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+        assert read_df["active"].tolist()[::2] == [True, False]
+        assert pd.isna(read_df["active"].iloc[1])
+    
+    def test_csv_read_non_utf8_file(self, temp_dir: Path):
+        """Test non-UTF-8 text is left to pandas, which rejects it, not read as bytes."""
+        csv_path = temp_dir / "test_cp1252.csv"
+        csv_path.write_bytes("customer,revenue\nCafé Müller,100\nAcme,200\n".encode("cp1252"))
+        
+        with pytest.raises(UnicodeDecodeError):
+            StorageService.read_csv(csv_path)
+    
+    def test_csv_read_falls_back_to_pandas(self, temp_dir: Path):
+        """Test files the Arrow reader rejects are still read by pandas."""
+        csv_path = temp_dir / "test_ragged.csv"
+        csv_path.write_text("a,b\n1,2\n3\n")
+        
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), read_df)
+    
+    def test_csv_arrow_write_checksum(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test Arrow CSV writer round-trips data and returns the file checksum."""
+        csv_path = temp_dir / "test_arrow.csv"
+        
+        checksum = StorageService.write_csv_arrow(sample_df, csv_path)
+        
+        assert checksum == StorageService.calculate_checksum(csv_path)
+        read_df = StorageService.read_csv(csv_path)
+        pd.testing.assert_frame_equal(sample_df, read_df)
+    
+    def test_csv_arrow_write_from_table(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test Arrow CSV writer accepts a pre-converted Arrow Table."""
+        import pyarrow as pa
+        
+        df_path = temp_dir / "from_df.csv"
+        table_path = temp_dir / "from_table.csv"
+        
+        df_checksum = StorageService.write_csv_arrow(sample_df, df_path)
+        table = pa.Table.from_pandas(sample_df, preserve_index=False)
+        table_checksum = StorageService.write_csv_arrow(table, table_path)
+        
+        assert df_checksum == table_checksum
+    
+    def test_csv_arrow_matches_pandas_output(self, temp_dir: Path):
+        """Test Arrow CSV writer produces the same text as pandas' to_csv."""
+        df = pd.DataFrame({
+            "date": pd.to_datetime(["2023-03-02", None]),
+            "timestamp": pd.to_datetime(["2023-03-02 01:02:03", "2023-03-02 00:00:00"]),
+            "flag": [True, False],
+            "value": [1.0, float("nan")],
+            "text": ['a,b "c"', None],
+            "category": pd.Categorical(["x", "y"]),
+        })
+        csv_path = temp_dir / "compat.csv"
+        
+        StorageService.write_csv_arrow(df, csv_path)
+        
+        assert csv_path.read_text() == df.to_csv(index=False)
+    
+    def test_csv_arrow_tz_aware_timestamps_match_pandas(self, temp_dir: Path):
+        """Test tz-aware timestamps, not formatted by Arrow, are written by pandas."""
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime(["2023-01-01", "2023-01-02 12:30"]).tz_localize("UTC"),
+            "value": [1, 2],
+        })
+        csv_path = temp_dir / "tz.csv"
+        
+        checksum = StorageService.write_csv_arrow(df, csv_path)
+        
+        assert csv_path.read_text() == df.to_csv(index=False)
+        assert checksum == StorageService.calculate_checksum(csv_path)
+    
     def test_excel_write_single_sheet(self, temp_dir: Path, sample_df: pd.DataFrame):
         """Test writing single sheet Excel file."""
         excel_path = temp_dir / "test_single.xlsx"
@@ -97,6 +238,46 @@ class TestStorageService:
         read_df = StorageService.read_excel(excel_path)
         pd.testing.assert_frame_equal(sample_df, read_df)
     
+    def test_excel_write_with_checksum(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test Excel writer that returns the checksum of the written file."""
+        excel_path = temp_dir / "test_checksum.xlsx"
+        
+        checksum = StorageService.write_excel_with_checksum(sample_df, excel_path)
+        
+        assert checksum == StorageService.calculate_checksum(excel_path)
+        read_df = StorageService.read_excel(excel_path)
+        pd.testing.assert_frame_equal(sample_df, read_df)
+    
+    def test_excel_write_across_row_slices(self, temp_dir: Path, monkeypatch):
+        """Test frames converted in several row slices are written whole and in order."""
+        monkeypatch.setattr("services.storage._SHEET_SLICE_ROWS", 3)
+        df = pd.DataFrame({
+            "id": range(10),
+            "value": [float(i) if i % 4 else None for i in range(10)],
+        })
+        excel_path = temp_dir / "test_slices.xlsx"
+        
+        StorageService.write_excel(df, excel_path)
+        
+        read_df = StorageService.read_excel(excel_path)
+        pd.testing.assert_frame_equal(df, read_df)
+    
+    def test_excel_write_infinities_as_text(self, temp_dir: Path):
+        """Test infinities are written as "inf"/"-inf" text, as pandas' to_excel does."""
+        df = pd.DataFrame({
+            "ratio": [float("inf"), 1.5, float("-inf"), None],
+            "mixed": pd.Series([np.float64("inf"), "a", 2, None], dtype=object),
+        })
+        excel_path = temp_dir / "test_inf.xlsx"
+        pandas_path = temp_dir / "test_inf_pandas.xlsx"
+        
+        StorageService.write_excel(df, excel_path)
+        df.to_excel(pandas_path, index=False)
+        
+        read_df = StorageService.read_excel(excel_path)
+        assert read_df["ratio"].tolist()[:3] == ["inf", 1.5, "-inf"]
+        pd.testing.assert_frame_equal(StorageService.read_excel(pandas_path), read_df)
+    
     def test_excel_write_multiple_sheets(self, temp_dir: Path, sample_df: pd.DataFrame):
         """Test writing Excel file with multiple sheets."""
         excel_path = temp_dir / "test_multi.xlsx"
@@ -127,6 +308,65 @@ class TestStorageService:
         expected_summary = sheets_data["Summary"]
         pd.testing.assert_frame_equal(expected_summary, summary_df)
     
+    def test_excel_write_row_tuple_sheet(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test a sheet given as row tuples (header first) is written like a DataFrame."""
+        excel_path = temp_dir / "test_rows.xlsx"
+        
+        sheets_data = {
+            "Revenue": sample_df,
+            "Parameters": [("Parameter", "Value"), ("Group By", "Company"), ("Thresholds", "[10, 20]")]
+        }
+        
+        StorageService.write_excel(sheets_data, excel_path)
+        
+        params_df = StorageService.read_excel(excel_path, sheet_name="Parameters")
+        expected = pd.DataFrame({"Parameter": ["Group By", "Thresholds"], "Value": ["Company", "[10, 20]"]})
+        pd.testing.assert_frame_equal(expected, params_df)
+    
+    def test_excel_write_fast_round_trip(self, temp_dir: Path, sample_df: pd.DataFrame):
+        """Test the streaming XLSX writer produces a readable multi-sheet workbook."""
+        excel_path = temp_dir / "test_fast.xlsx"
+        
+        sheets_data = {
+            "Details": sample_df,
+            "Notes": pd.DataFrame({"Note": ["a & b", "<tag>", None], "Flag": [True, False, True]})
+        }
+        
+        result_path = StorageService.write_excel_fast(sheets_data, excel_path)
+        assert result_path == str(excel_path)
+        
+        workbook = load_workbook(excel_path)
+        assert workbook.sheetnames == ["Details", "Notes"]
+        
+        details_df = StorageService.read_excel(excel_path, sheet_name="Details")
+        pd.testing.assert_frame_equal(sample_df, details_df)
+        
+        notes_df = StorageService.read_excel(excel_path, sheet_name="Notes")
+        assert notes_df["Note"].tolist()[:2] == ["a & b", "<tag>"]
+        assert pd.isna(notes_df["Note"].iloc[2])
+        assert notes_df["Flag"].tolist() == [True, False, True]
+    
+    def test_excel_write_fast_numpy_and_tz_aware_values(self, temp_dir: Path):
+        """Test numpy scalars in object columns and tz-aware timestamps keep their cell types."""
+        df = pd.DataFrame({
+            "float": pd.Series([np.float64(1.5), "x"], dtype=object),
+            "int": pd.Series([np.int64(7), "y"], dtype=object),
+            "flag": pd.Series([np.bool_(True), "z"], dtype=object),
+            "when": pd.to_datetime(["2023-01-01 12:00", "2023-06-01"]).tz_localize("US/Eastern"),
+        })
+        excel_path = temp_dir / "test_fast_types.xlsx"
+        
+        StorageService.write_excel_fast({"Data": df}, excel_path)
+        
+        sheet = load_workbook(excel_path)["Data"]
+        float_cell, int_cell, flag_cell, when_cell = sheet[2]
+        assert float_cell.value == 1.5 and float_cell.data_type == "n"
+        assert int_cell.value == 7 and int_cell.data_type == "n"
+        assert flag_cell.value is True
+        # Written as local wall time, without the offset
+        assert when_cell.value == datetime(2023, 1, 1, 12, 0)
+        assert [cell.value for cell in sheet[3]][:3] == ["x", "y", "z"]
+    
     def test_excel_read_specific_sheet(self, temp_dir: Path, sample_df: pd.DataFrame):
         """Test reading specific sheet from Excel."""
         excel_path = temp_dir / "test_sheets.xlsx"